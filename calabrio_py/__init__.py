@@ -1,4 +1,9 @@
 from .api import ApiClient, AsyncApiClient
+from .cache import DiskResponseCache, ResponseCache
+from .codec import JsonCodec, OrjsonCodec
+from .config_index import ConfigIndex
+from .ratelimit import AdaptiveRateLimiter
+from .retry import RetryPolicy
 
 # Optional: manager utilities depend on heavy packages (e.g., pandas, numpy, tqdm).
 # Expose them only if dependencies are available to avoid import-time failures.
@@ -1,11 +1,19 @@
 import requests
+from requests.adapters import HTTPAdapter
 import aiohttp
 import asyncio
+import copy
 from requests.exceptions import RequestException
+import time
+from urllib.parse import urlsplit
 from datetime import datetime
 from typing import List, Dict, Any
 import logging
 
+from .codec import get_default_codec
+from .retry import RetryPolicy
+from .streaming import ResultStreamParser
+
 logger = logging.getLogger('api_client')
 
 class ExternalMeeting:
@@ -72,10 +80,34 @@ class CustomApiException(Exception):
 
 
 class ApiClientBase:
-    def __init__(self, base_url, api_key):
+    def __init__(self, base_url, api_key, rate_limiter=None, retry_policy=None, codec=None, coalesce_queries=True, cache=None):
         self.base_url = base_url
         self.api_key = api_key
         self.is_async = False
+        # Encodes request bodies and decodes response bytes (orjson when installed)
+        self.codec = codec if codec is not None else get_default_codec()
+        self.stream_chunk_size = 64 * 1024
+        # In-flight query tasks keyed by request, used to coalesce duplicate async queries
+        self.coalesce_queries = coalesce_queries
+        self._inflight = {}
+        # Optional ResponseCache for reference-data query endpoints
+        self.cache = cache
+        # Pass RetryPolicy(max_attempts=1) to disable retries
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        # Optional AdaptiveRateLimiter shared by every request made through this client
+        self.rate_limiter = rate_limiter
+        # Keep-alive requests session for sync mode, created lazily
+        self._session = None
+        self._pool_options = {"pool_connections": 10, "pool_maxsize": 10}
+        # Long-lived aiohttp session, created lazily on the running event loop
+        self._async_session = None
+        self._async_session_loop = None
+        self._connector_options = {
+            "limit": 100,
+            "limit_per_host": 100,
+            "keepalive_timeout": 30,
+            "ttl_dns_cache": 300,
+        }
 
     def set_async(self, async_mode=True):
         self.is_async = async_mode
@@ -94,16 +126,94 @@ class ApiClientBase:
             return f"{self.base_url}/{url}"
         return self.base_url
 
+    def _get_sync_session(self):
+        if self._session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(**self._pool_options)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self._session = session
+        return self._session
+
+    def close(self):
+        session = self._session
+        self._session = None
+        if session is not None:
+            session.close()
+
+    def _endpoint_path(self, url):
+        """Endpoint path relative to base_url, e.g. /query/Site/AllSites."""
+        path = urlsplit(url).path
+        base_path = urlsplit(self.base_url).path.rstrip("/")
+        if base_path and path.startswith(base_path):
+            path = path[len(base_path):]
+        return path
+
+    def _cache_lookup(self, method, url, kwargs):
+        """Return (path, key, cached_response) for cacheable requests, or None."""
+        cache = self.cache
+        if cache is None or not self.retry_policy.is_idempotent(method, url):
+            return None
+        path = self._endpoint_path(url)
+        if cache.ttl_for(path) is None:
+            return None
+        key = self._request_key(method, url, kwargs)
+        return path, key, cache.get(path, key)
+
+    def _cache_store(self, lookup, response_json):
+        if lookup is None or not isinstance(response_json, dict) or response_json.get("Errors"):
+            return
+        path, key, _ = lookup
+        self.cache.set(path, key, response_json)
+
     def make_request_sync(self, method, url, **kwargs):
+        lookup = self._cache_lookup(method, url, kwargs)
+        if lookup is not None and lookup[2] is not None:
+            return lookup[2]
+        response_json = self._send_sync(method, url, **kwargs)
+        self._cache_store(lookup, response_json)
+        return response_json
+
+    def _send_sync(self, method, url, **kwargs):
+        session = self._get_sync_session()
+        limiter = self.rate_limiter
+        policy = self.retry_policy
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            if limiter is not None:
+                limiter.acquire_sync()
+            status = None
+            retry_after = None
+            try:
+                response = session.request(method, url, **kwargs)  
+                status = response.status_code
+                retry_after = response.headers.get("Retry-After")
+            except requests.exceptions.RequestException as e:
+                delay = policy.next_delay(attempt, method, url, started, error=e)
+                if delay is None:
+                    raise
+            else:
+                if status < 400:
+                    break
+                delay = policy.next_delay(attempt, method, url, started, status=status, retry_after=retry_after)
+                if delay is None:
+                    break
+            finally:
+                if limiter is not None:
+                    limiter.release(status, retry_after)
+            logger.warning("Retrying %s %s in %.1f seconds (attempt %d)", method, url, delay, attempt + 1)
+            time.sleep(delay)
+            attempt += 1
+
         try:
-            response = requests.request(method, url, **kwargs)  
             response.raise_for_status()
         except requests.exceptions.HTTPError as e:
             logger.error("HTTP Error: %s", str(e))
             return None
 
         try:  
-            response_json = response.json()
+            response_json = self.codec.loads(response.content)
         except ValueError as e:
             logger.error("Invalid JSON: %s", str(e))
             return None
@@ -116,27 +226,231 @@ class ApiClientBase:
         return response_json
 
 
+    async def _get_async_session(self):
+        """
+        Return the pooled aiohttp session, creating it on first use.
+
+        aiohttp sessions are bound to the event loop they were created on, so a new
+        session is opened when the client is reused from another loop (e.g. a second
+        asyncio.run call).
+        """
+        loop = asyncio.get_running_loop()
+        session = self._async_session
+        if session is None or session.closed or self._async_session_loop is not loop:
+            stale_session, stale_loop = session, self._async_session_loop
+            connector = aiohttp.TCPConnector(**self._connector_options)
+            session = aiohttp.ClientSession(
+                connector=connector,
+                headers={"Authorization": f"Bearer {self.api_key}"},
+            )
+            # Publish the new session before awaiting anything, so concurrent first
+            # requests on this loop share it instead of each creating their own
+            self._async_session = session
+            self._async_session_loop = loop
+            if stale_session is not None and not stale_session.closed:
+                logger.debug("Closing aiohttp session bound to a previous event loop")
+                await self._close_stale_session(stale_session, stale_loop)
+        return session
+
+    async def _close_stale_session(self, session, loop):
+        # A loop still running in another thread closes its own session; otherwise the
+        # old loop is gone and the connector can be released from here
+        if loop is not None and loop.is_running():
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+            return
+        try:
+            await session.close()
+        except Exception as e:
+            logger.debug("Error closing stale aiohttp session: %s", str(e))
+
+    async def aclose(self):
+        session = self._async_session
+        self._async_session = None
+        self._async_session_loop = None
+        if session is not None and not session.closed:
+            await session.close()
+
+    async def _read_async_response(self, response):
+        try:
+            response.raise_for_status()
+        except Exception as e:
+            logger.error("HTTP Error: %s", str(e))
+            return None
+
+        try:
+            response_json = self.codec.loads(await response.read())
+        except ValueError as e:
+            logger.error("Invalid JSON: %s", str(e))
+            return None
+
+        errors = response_json.get("Errors", []) if isinstance(response_json, dict) else []
+        if errors:
+            error_messages = [error["Message"] for error in errors]
+            logger.error("API Errors: %s", "\n".join(error_messages))
+
+        return response_json
+
+    def _request_key(self, method, url, kwargs):
+        params = kwargs.get("params")
+        params_key = tuple(sorted((k, repr(v)) for k, v in params.items())) if params else None
+        return (method.upper(), url, kwargs.get("data"), params_key)
+
     async def make_request_async(self, method, url, **kwargs):
-        async with aiohttp.ClientSession(headers={"Authorization": f"Bearer {self.api_key}"}) as session:
-            async with session.request(method, url, **kwargs) as response:
-                try:
-                    response.raise_for_status()
-                except Exception as e:
-                    logger.error("HTTP Error: %s", str(e))
-                    return None
-
-                try:
-                    response_json = await response.json()  
-                except ValueError as e:
-                    logger.error("Invalid JSON: %s", str(e))
-                    return None
-
-                errors = response_json.get("Errors", []) if isinstance(response_json, dict) else []
-                if errors:
-                    error_messages = [error["Message"] for error in errors]
-                    logger.error("API Errors: %s", "\n".join(error_messages))
-
-                return response_json
+        """
+        Send a request and return the decoded JSON body.
+
+        Reference-data queries are answered from self.cache when one is configured.
+        Identical concurrent query requests (same method, URL, body and params) are
+        coalesced into a single network call when coalesce_queries is enabled; callers
+        that joined an in-flight request receive their own copy of the response.
+        """
+        lookup = self._cache_lookup(method, url, kwargs)
+        if lookup is not None and lookup[2] is not None:
+            return lookup[2]
+        response_json = await self._coalesced_send_async(method, url, **kwargs)
+        self._cache_store(lookup, response_json)
+        return response_json
+
+    async def _coalesced_send_async(self, method, url, **kwargs):
+        if not (self.coalesce_queries and self.retry_policy.is_idempotent(method, url)):
+            return await self._send_async(method, url, **kwargs)
+
+        loop = asyncio.get_running_loop()
+        key = self._request_key(method, url, kwargs)
+        task = self._inflight.get(key)
+        joined = not (task is None or task.done() or task.get_loop() is not loop)
+        if not joined:
+            task = loop.create_task(self._send_async(method, url, **kwargs))
+            self._inflight[key] = task
+
+            def _forget(done, key=key):
+                if self._inflight.get(key) is done:
+                    del self._inflight[key]
+
+            task.add_done_callback(_forget)
+        # Shield so one cancelled caller does not cancel the shared request for the others
+        response_json = await asyncio.shield(task)
+        # Response dicts are mutable; only the caller that started the request keeps the original
+        return copy.deepcopy(response_json) if joined else response_json
+
+    async def _send_async(self, method, url, **kwargs):
+        limiter = self.rate_limiter
+        policy = self.retry_policy
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            if limiter is not None:
+                await limiter.acquire()
+            status = None
+            retry_after = None
+            try:
+                session = await self._get_async_session()
+                async with session.request(method, url, **kwargs) as response:
+                    status = response.status
+                    retry_after = response.headers.get("Retry-After")
+                    delay = None
+                    if status >= 400:
+                        delay = policy.next_delay(attempt, method, url, started, status=status, retry_after=retry_after)
+                    if delay is None:
+                        return await self._read_async_response(response)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                delay = policy.next_delay(attempt, method, url, started, error=e)
+                if delay is None:
+                    raise
+            finally:
+                if limiter is not None:
+                    limiter.release(status, retry_after)
+            logger.warning("Retrying %s %s in %.1f seconds (attempt %d)", method, url, delay, attempt + 1)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def _close_stream(self, parser):
+        envelope = parser.close()
+        errors = envelope.get("Errors", []) if isinstance(envelope, dict) else []
+        if errors:
+            error_messages = [error["Message"] for error in errors]
+            logger.error("API Errors: %s", "\n".join(error_messages))
+
+    def stream_request_sync(self, method, url, **kwargs):
+        """
+        Generator yielding the items of the response's "Result" array as they are received.
+        Retries apply only until the response starts streaming.
+        """
+        session = self._get_sync_session()
+        limiter = self.rate_limiter
+        policy = self.retry_policy
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            if limiter is not None:
+                limiter.acquire_sync()
+            status = None
+            retry_after = None
+            try:
+                with session.request(method, url, stream=True, **kwargs) as response:
+                    status = response.status_code
+                    retry_after = response.headers.get("Retry-After")
+                    if status < 400:
+                        parser = ResultStreamParser(self.codec)
+                        for chunk in response.iter_content(chunk_size=self.stream_chunk_size):
+                            yield from parser.feed(chunk)
+                        self._close_stream(parser)
+                        return
+                    delay = policy.next_delay(attempt, method, url, started, status=status, retry_after=retry_after)
+                    if delay is None:
+                        logger.error("HTTP Error: %s for url: %s", status, url)
+                        return
+            except requests.exceptions.RequestException as e:
+                delay = None if status is not None else policy.next_delay(attempt, method, url, started, error=e)
+                if delay is None:
+                    raise
+            finally:
+                if limiter is not None:
+                    limiter.release(status, retry_after)
+            logger.warning("Retrying %s %s in %.1f seconds (attempt %d)", method, url, delay, attempt + 1)
+            time.sleep(delay)
+            attempt += 1
+
+    async def stream_request_async(self, method, url, **kwargs):
+        """
+        Async generator yielding the items of the response's "Result" array as they are received.
+        Retries apply only until the response starts streaming.
+        """
+        limiter = self.rate_limiter
+        policy = self.retry_policy
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            if limiter is not None:
+                await limiter.acquire()
+            status = None
+            retry_after = None
+            try:
+                session = await self._get_async_session()
+                async with session.request(method, url, **kwargs) as response:
+                    status = response.status
+                    retry_after = response.headers.get("Retry-After")
+                    if status < 400:
+                        parser = ResultStreamParser(self.codec)
+                        async for chunk in response.content.iter_chunked(self.stream_chunk_size):
+                            for item in parser.feed(chunk):
+                                yield item
+                        self._close_stream(parser)
+                        return
+                    delay = policy.next_delay(attempt, method, url, started, status=status, retry_after=retry_after)
+                    if delay is None:
+                        logger.error("HTTP Error: %s for url: %s", status, url)
+                        return
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                delay = None if status is not None else policy.next_delay(attempt, method, url, started, error=e)
+                if delay is None:
+                    raise
+            finally:
+                if limiter is not None:
+                    limiter.release(status, retry_after)
+            logger.warning("Retrying %s %s in %.1f seconds (attempt %d)", method, url, delay, attempt + 1)
+            await asyncio.sleep(delay)
+            attempt += 1
 
     def make_request(self, method, url, **kwargs):
         if self.is_async:
@@ -144,20 +458,31 @@ class ApiClientBase:
         else:
             return self.make_request_sync(method, url, **kwargs)
 
-    def get(self, url, params=None):
+    def make_stream(self, method, url, **kwargs):
+        if self.is_async:
+            return self.stream_request_async(method, url, **kwargs)
+        else:
+            return self.stream_request_sync(method, url, **kwargs)
+
+    def get(self, url, params=None, stream=False):
         headers = {
             "Authorization": f"Bearer {self.api_key}"
         }
         abs_url = self._build_url(url)
+        if stream:
+            return self.make_stream("GET", abs_url, headers=headers, params=params)
         return self.make_request("GET", abs_url, headers=headers, params=params)
 
-    def post(self, url, data=None):
+    def post(self, url, data=None, stream=False):
         headers = {
             "Content-Type": "application/json",
             "Authorization": f"Bearer {self.api_key}"
         }
         abs_url = self._build_url(url)
-        return self.make_request("POST", abs_url, headers=headers, json=data)
+        body = self.codec.dumps(data) if data is not None else None
+        if stream:
+            return self.make_stream("POST", abs_url, headers=headers, data=body)
+        return self.make_request("POST", abs_url, headers=headers, data=body)
 
     def get_all_commands(self):
         url = "/command"
@@ -851,7 +1176,7 @@ class ApiClientBase:
         }
         return self.post(url, request_data)
 
-    def get_people_by_team_id(self, team_id, date, include_optional_columns=False):
+    def get_people_by_team_id(self, team_id, date, include_optional_columns=False, stream=False):
         url = f"{self.base_url}/query/Person/PeopleByTeamId"
         request_data = {
             "TeamId": team_id,
@@ -860,7 +1185,7 @@ class ApiClientBase:
                 "OptionalColumns": include_optional_columns
             }
         }
-        return self.post(url, request_data)
+        return self.post(url, request_data, stream=stream)
 
     def get_person_by_id(self, person_id, date, include_optional_columns=False):
         url = f"{self.base_url}/query/Person/PersonById"
@@ -916,7 +1241,7 @@ class ApiClientBase:
         return self.post(url, request_data)
 
     def get_schedules_by_change_date(self, changes_from, changes_to, page, page_size,
-                                     business_unit_id=None, start_date=None, end_date=None):
+                                     business_unit_id=None, start_date=None, end_date=None, stream=False):
         url = f"{self.base_url}/query/ScheduleChanges/SchedulesByChangeDate"
         params = {
             "ChangesFrom": changes_from,
@@ -927,7 +1252,7 @@ class ApiClientBase:
             "period.StartDate": start_date,
             "period.EndDate": end_date
         }
-        response = self.get(url, params=params)
+        response = self.get(url, params=params, stream=stream)
         return response
 
     def get_schedule_by_person_id(self, person_id, start_date, end_date, scenario_id=None):
@@ -942,7 +1267,7 @@ class ApiClientBase:
         }
         return self.post(url, request_data)
     
-    def get_schedule_by_person_ids(self, person_ids, start_date, end_date, scenario_id=None):
+    def get_schedule_by_person_ids(self, person_ids, start_date, end_date, scenario_id=None, stream=False):
         url = f"{self.base_url}/query/Schedule/ScheduleByPersonIds"
         request_data = {
             "PersonIds": person_ids,
@@ -952,9 +1277,9 @@ class ApiClientBase:
             },
             "ScenarioId": scenario_id
         }
-        return self.post(url, request_data)
+        return self.post(url, request_data, stream=stream)
 
-    def get_schedule_by_team_id(self, business_unit_id, team_id, start_date, end_date, scenario_id=None):
+    def get_schedule_by_team_id(self, business_unit_id, team_id, start_date, end_date, scenario_id=None, stream=False):
         url = f"{self.base_url}/query/Schedule/ScheduleByTeamId"
         request_data = {
             "BusinessUnitId": business_unit_id,
@@ -965,7 +1290,7 @@ class ApiClientBase:
             },
             "ScenarioId": scenario_id
         }
-        return self.post(url, request_data)
+        return self.post(url, request_data, stream=stream)
 
     def query_schedule_by_group_page_groups(self, business_unit_id, group_page_group_ids, period, scenario_id=None):
         url = f"{self.base_url}/query/ScheduleByGroupPageGroups"
@@ -1089,10 +1414,55 @@ class ApiClientBase:
 
 
 class ApiClient(ApiClientBase):
-    def __init__(self, base_url, api_key):
-        super().__init__(base_url, api_key)
+    """
+    Synchronous client backed by a keep-alive requests.Session.
+
+    Use it as a context manager, or call close() when done:
+
+        with ApiClient(api_url, api_key) as client:
+            client.get_all_business_units()
+    """
+
+    def __init__(self, base_url, api_key, pool_connections=10, pool_maxsize=10, **kwargs):
+        super().__init__(base_url, api_key, **kwargs)
+        self._pool_options = {
+            "pool_connections": pool_connections,
+            "pool_maxsize": pool_maxsize,
+        }
+
+    def __enter__(self):
+        self._get_sync_session()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
 
 class AsyncApiClient(ApiClientBase):
-    def __init__(self, base_url, api_key):
-        super().__init__(base_url, api_key)
+    """
+    Asynchronous client backed by a single pooled aiohttp session.
+
+    Use it as an async context manager, or call aclose() when done, so that pooled
+    keep-alive connections are released:
+
+        async with AsyncApiClient(api_url, api_key) as client:
+            await client.get_all_business_units()
+    """
+
+    def __init__(self, base_url, api_key, limit=100, limit_per_host=100, keepalive_timeout=30, ttl_dns_cache=300, **kwargs):
+        super().__init__(base_url, api_key, **kwargs)
         self.set_async(True)
+        self._connector_options = {
+            "limit": limit,
+            "limit_per_host": limit_per_host,
+            "keepalive_timeout": keepalive_timeout,
+            "ttl_dns_cache": ttl_dns_cache,
+        }
+
+    async def __aenter__(self):
+        await self._get_async_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+        return False
@@ -0,0 +1,241 @@
+import os
+import copy
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+
+from .codec import get_default_codec
+
+# Query endpoints returning slowly changing reference data (the get_all_* methods)
+REFERENCE_DATA_PATHS = (
+    "/query/Absence/AllAbsences",
+    "/query/Activity/AllActivities",
+    "/query/Availability/AllAvailabilities",
+    "/query/BudgetGroup/AllBudgetGroups",
+    "/query/BusinessUnit/AllBusinessUnits",
+    "/query/Contract/AllContracts",
+    "/query/ContractSchedule/AllContractSchedules",
+    "/query/DayOffTemplate/AllDayOffTemplates",
+    "/query/MultiplicatorDefinitionSet/AllMultiplicatorDefinitionSets",
+    "/query/OptionalColumn/AllOptionalColumns",
+    "/query/PartTimePercentage/AllPartTimePercentages",
+    "/query/Role/AllRoles",
+    "/query/Rotation/AllRotations",
+    "/query/Scenario/AllScenarios",
+    "/query/ShiftBag/AllShiftBags",
+    "/query/ShiftCategory/AllShiftCategories",
+    "/query/Site/AllSites",
+    "/query/Skill/AllSkills",
+    "/query/SkillGroup/AllSkillGroups",
+    "/query/Team/AllTeams",
+    "/query/WorkflowControlSet/AllWorkflowControlSets",
+)
+
+
+class ResponseCache:
+    """
+    In-memory LRU cache for query responses, keyed by endpoint and request body.
+
+    Only endpoints with a TTL are cached: every path in paths gets default_ttl unless
+    ttls overrides it (ttls may also add endpoints outside paths). The least recently
+    used entry is evicted once max_entries is reached.
+
+    Responses are copied when stored and when returned, so every caller gets its own
+    copy, like callers of a coalesced request.
+    """
+
+    def __init__(self, max_entries=1024, default_ttl=600, ttls=None, paths=REFERENCE_DATA_PATHS):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.ttls = dict(ttls or {})
+        self.paths = frozenset(paths)
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def ttl_for(self, path):
+        if path in self.ttls:
+            return self.ttls[path]
+        if path in self.paths:
+            return self.default_ttl
+        return None
+
+    def get(self, path, key):
+        """Return the cached response, or None on a miss or when the entry has expired."""
+        entry = self._entries.get((path, key))
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[(path, key)]
+            self.misses += 1
+            return None
+        self._entries.move_to_end((path, key))
+        self.hits += 1
+        return copy.deepcopy(value)
+
+    def set(self, path, key, value):
+        ttl = self.ttl_for(path)
+        if not ttl:
+            return
+        self._entries[(path, key)] = (time.monotonic() + ttl, copy.deepcopy(value))
+        self._entries.move_to_end((path, key))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, path=None):
+        """Drop every entry for the given endpoint path, or the whole cache when path is None."""
+        if path is None:
+            self._entries.clear()
+            return
+        for entry_key in [k for k in self._entries if k[0] == path]:
+            del self._entries[entry_key]
+
+    def stats(self):
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class DiskResponseCache(ResponseCache):
+    """
+    Response cache persisted in a SQLite database under cache_dir, shared by every
+    process pointing at the same directory.
+
+    Entries expire by wall-clock time so TTLs hold across processes. The database runs
+    in WAL mode so readers do not block writers; when the stored responses exceed
+    max_bytes the least recently used ones are deleted. Hit/miss counters are per process.
+    """
+
+    def __init__(
+        self,
+        cache_dir,
+        max_bytes=256 * 1024 * 1024,
+        default_ttl=600,
+        ttls=None,
+        paths=REFERENCE_DATA_PATHS,
+        codec=None,
+        filename="responses.sqlite3",
+    ):
+        super().__init__(max_entries=None, default_ttl=default_ttl, ttls=ttls, paths=paths)
+        cache_dir = os.path.expanduser(cache_dir)
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, filename)
+        self.max_bytes = max_bytes
+        self.codec = codec if codec is not None else get_default_codec()
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+
+    def _connection(self):
+        # Connections must not be shared with forked worker processes
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY,"
+                " path TEXT NOT NULL,"
+                " expires_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " value BLOB NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS responses_path ON responses (path)")
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    @staticmethod
+    def _digest(path, key):
+        return hashlib.sha256(repr((path, key)).encode("utf-8")).hexdigest()
+
+    def get(self, path, key):
+        digest = self._digest(path, key)
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT expires_at, value FROM responses WHERE key = ?", (digest,)
+            ).fetchone()
+            if row is None or row[0] <= now:
+                if row is not None:
+                    conn.execute("DELETE FROM responses WHERE key = ? AND expires_at <= ?", (digest, now))
+                self.misses += 1
+                return None
+            conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, digest))
+            self.hits += 1
+        return self.codec.loads(row[1])
+
+    def set(self, path, key, value):
+        ttl = self.ttl_for(path)
+        if not ttl:
+            return
+        blob = self.codec.dumps(value)
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, path, expires_at, accessed_at, size, value)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (self._digest(path, key), path, now + ttl, now, len(blob), blob),
+                )
+                self._evict(conn, now)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def _evict(self, conn, now):
+        conn.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = conn.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall()
+        stale = []
+        for digest, size in rows:
+            if total <= self.max_bytes:
+                break
+            stale.append((digest,))
+            total -= size
+        conn.executemany("DELETE FROM responses WHERE key = ?", stale)
+        self.evictions += len(stale)
+
+    def invalidate(self, path=None):
+        with self._lock:
+            conn = self._connection()
+            if path is None:
+                conn.execute("DELETE FROM responses")
+            else:
+                conn.execute("DELETE FROM responses WHERE path = ?", (path,))
+
+    def stats(self):
+        with self._lock:
+            entries, size = self._connection().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        return {
+            "entries": entries,
+            "bytes": size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
@@ -0,0 +1,52 @@
+import json
+from datetime import date, datetime
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def _default(obj):
+    """Serialize values the JSON encoders do not handle natively."""
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    # Request objects such as AddPersonRequest or ExternalMeeting
+    if hasattr(obj, "__dict__"):
+        return vars(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class JsonCodec:
+    """Codec backed by the standard library json module."""
+
+    name = "json"
+
+    def dumps(self, obj):
+        return json.dumps(obj, default=_default, separators=(",", ":")).encode("utf-8")
+
+    def loads(self, data):
+        return json.loads(data)
+
+
+class OrjsonCodec:
+    """Codec backed by orjson, which encodes and decodes several times faster than json."""
+
+    name = "orjson"
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError("OrjsonCodec requires orjson. Install it with: pip install orjson")
+
+    def dumps(self, obj):
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+    def loads(self, data):
+        return orjson.loads(data)
+
+
+def get_default_codec():
+    """Return OrjsonCodec when orjson is installed, JsonCodec otherwise."""
+    if orjson is not None:
+        return OrjsonCodec()
+    return JsonCodec()
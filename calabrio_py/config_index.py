@@ -0,0 +1,87 @@
+class ConfigIndex:
+    """
+    Hash index over config_data for constant-time ID and name resolution.
+
+    Built once from the config_data structure produced by ConfigManager. Entity types
+    are the config keys ("teams", "absences", "contracts", ...):
+
+        index = ConfigIndex(config_data)
+        team_id = index.id_for("Tokyo", "teams", "Team A")
+        absence = index.record_for("absences", absence_id)
+    """
+
+    def __init__(self, config_data):
+        self._ids = {}
+        self._records = {}
+        self._names = {}
+        self._bu_names = {}
+        self._category_dtypes = {}
+        self.business_unit_ids = {}
+
+        for bu in config_data["bus"]:
+            bu_name = bu["Name"]
+            self.business_unit_ids[bu_name] = bu["Id"]
+            for entity, response in config_data.get(bu_name, {}).items():
+                records = response.get("Result") if isinstance(response, dict) else None
+                for record in records or []:
+                    record_id = record.get("Id")
+                    name = record.get("Name")
+                    if name is not None:
+                        self._ids.setdefault((bu_name, entity, name), record_id)
+                        self._names.setdefault((entity, name), []).append(bu_name)
+                    if record_id is not None:
+                        self._records[(entity, record_id)] = record
+                        self._bu_names[(entity, record_id)] = bu_name
+
+    def id_for(self, bu_name, entity, name, default=None):
+        """ID of the entity called name in the given business unit."""
+        return self._ids.get((bu_name, entity, name), default)
+
+    def record_for(self, entity, record_id, default=None):
+        """Config record (as returned by the API) for an entity ID."""
+        return self._records.get((entity, record_id), default)
+
+    def name_for(self, entity, record_id, default=None):
+        record = self._records.get((entity, record_id))
+        return record.get("Name", default) if record is not None else default
+
+    def bu_name_for(self, entity, record_id, default=None):
+        """Name of the business unit the entity ID belongs to."""
+        return self._bu_names.get((entity, record_id), default)
+
+    def bu_names_for(self, entity, name):
+        """Business units that have an entity with the given name."""
+        return list(self._names.get((entity, name), []))
+
+    def business_unit_id(self, bu_name, default=None):
+        return self.business_unit_ids.get(bu_name, default)
+
+    def records(self, entity):
+        """All records of an entity type with their BusinessUnitName, for building DataFrames."""
+        return [
+            {**record, "BusinessUnitName": self._bu_names[key]}
+            for key, record in self._records.items()
+            if key[0] == entity
+        ]
+
+    def category_dtype(self, entity, values=()):
+        """
+        pandas CategoricalDtype over the names of an entity type ("bus" for business
+        units), shared by every frame converted with this index. Names in values that are
+        not in the config are appended, so codes of already converted frames stay valid.
+        """
+        import pandas as pd
+
+        dtype = self._category_dtypes.get(entity)
+        if dtype is None:
+            if entity == "bus":
+                names = list(self.business_unit_ids)
+            else:
+                names = list(dict.fromkeys(name for e, name in self._names if e == entity))
+            dtype = pd.CategoricalDtype(names)
+        values = pd.Index(pd.unique(pd.Series(values, dtype=object).dropna()))
+        missing = values[dtype.categories.get_indexer(values) == -1]
+        if len(missing):
+            dtype = pd.CategoricalDtype(dtype.categories.append(missing))
+        self._category_dtypes[entity] = dtype
+        return dtype
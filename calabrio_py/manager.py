@@ -1,129 +1,474 @@
+import warnings
+
+from .retry import RetryPolicy
+from .config_index import ConfigIndex
+from .snapshot import (
+    LazyMapping,
+    is_snapshot_path,
+    load_config_snapshot,
+    write_config_snapshot,
+)
+
+
 def retry(func):
-    MAX_RETRIES = 5
+    """
+    Deprecated: retries are handled by the client's retry_policy
+    (ApiClientBase.retry_policy).
+
+    Retries a coroutine function on any exception using a default RetryPolicy.
+    """
+    warnings.warn(
+        "calabrio_py.manager.retry is deprecated; configure retry_policy on the client instead",
+        DeprecationWarning,
+        stacklevel=2,
+    )
+    policy = RetryPolicy()
 
     async def wrapper(*args, **kwargs):
-        for retry in range(MAX_RETRIES):
-            try:
-                return await func(*args, **kwargs)
-            except Exception as e:
-                wait_time = 5**retry
-                print(f"Error: {e}. Retrying in {wait_time} seconds...")
-                await asyncio.sleep(wait_time)
-        return await func(*args, **kwargs)
+        return await policy.run(func, *args, **kwargs)
 
     return wrapper
 
 
+def _warn_ignored_retries(name, value):
+    # max_retries / max_retry are still accepted for backward compatibility only
+    if value is not None:
+        warnings.warn(
+            f"{name} is ignored; retries are configured with the client's retry_policy "
+            "(ApiClientBase.retry_policy)",
+            DeprecationWarning,
+            stacklevel=3,
+        )
+
+
+CONFIG_API_METHODS = [
+    "get_all_sites",
+    "get_all_teams",
+    "get_all_skills",
+    "get_all_shift_bags",
+    "get_all_budget_groups",
+    "get_all_absences",
+    "get_all_activities",
+    "get_all_contracts",
+    "get_all_contract_schedules",
+    "get_all_workflow_control_sets",
+    "get_all_part_time_percentages",
+    "get_all_shift_categories",
+    "get_all_scenarios",
+    "get_all_roles",
+    "get_all_optional_column",
+]
+
+
 class ConfigManager:
     """
     This class is used to load the config data from the API and save it to a file
     (saving a file is optional. if you don't need to save, you can leave config_path blank).
 
     The config data is used to map the IDs to the names of the entities.
+
+    For every business unit and entity type, config_meta records when it was fetched
+    and a hash of the response, so refresh_config() can refetch only stale entries.
     """
 
     def __init__(self, client=None, config_path=None):
         self.client = client
         self.config_path = config_path
         self.config_data = None
+        self.config_meta = {}
 
     def get_client(self):
         return self.client
 
     async def get_async_client(self):
-        if self.client.set_async:
+        if getattr(self.client, "is_async", False):
             return self.client
         return None
 
     async def fetch_config_data(self):
         if self.config_path:
             try:
-                with open(self.config_path) as file:
-                    self.config_data = json.load(file)
+                self.load_config()
             except FileNotFoundError:
                 await self.create_config_from_api()
         else:
             self.config_data = await self.create_config_from_api()
 
-    async def create_config_from_api(self, exclude_bu_names=[]):
+    def load_config(self):
+        """
+        Load config_path. Paths ending in .msgpack/.mpk are binary snapshots that are
+        memory-mapped and decoded lazily per business unit and entity type.
+        """
+        if is_snapshot_path(self.config_path):
+            self.config_data = load_config_snapshot(self.config_path)
+            self.config_meta = dict(self.config_data.meta)
+            return self.config_data
+
+        with open(self.config_path) as file:
+            self.config_data = json.load(file)
+        self.config_meta = self.config_data.pop("_meta", {})
+        return self.config_data
+
+    def save_config(self):
+        if is_snapshot_path(self.config_path):
+            write_config_snapshot(self.config_path, self.config_data, self.config_meta)
+            return
+
+        config_data = self.config_data
+        if isinstance(config_data, LazyMapping):
+            config_data = config_data.to_dict()
+        with open(self.config_path, "w") as file:
+            json.dump({**config_data, "_meta": self.config_meta}, file)
+
+    @staticmethod
+    def _hash_response(response):
+        return hashlib.sha256(
+            json.dumps(response, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+
+    async def _fetch_config_entries(self, client, jobs, max_concurrent):
+        """Fetch (bu, method_name) jobs, concurrently for async clients."""
+        if getattr(client, "is_async", False):
+            semaphore = asyncio.Semaphore(max_concurrent)
+
+            async def fetch(bu, method_name):
+                async with semaphore:
+                    return await getattr(client, method_name)(bu["Id"])
+
+            return await asyncio.gather(
+                *[fetch(bu, method_name) for bu, method_name in jobs]
+            )
+        return [getattr(client, method_name)(bu["Id"]) for bu, method_name in jobs]
+
+    def _store_config_entry(self, bu_name, method_name, result, fetched_at):
+        """Store one entity response and return True if its content changed."""
+        config_key = method_name.split("get_all_")[1]  # Get the config key name
+        digest = self._hash_response(result)
+        previous = self.config_meta.get(bu_name, {}).get(config_key)
+        self.config_data[bu_name][config_key] = result
+        self.config_meta.setdefault(bu_name, {})[config_key] = {
+            "fetched_at": fetched_at,
+            "hash": digest,
+        }
+        return previous is None or previous["hash"] != digest
+
+    async def _fetch_business_units(self, client):
+        if getattr(client, "is_async", False):
+            bus_list_res = await client.get_all_business_units()
+        else:
+            bus_list_res = client.get_all_business_units()
+        return bus_list_res["Result"]
+
+    async def create_config_from_api(self, exclude_bu_names=[], max_concurrent=20):
+        """
+        Fetch every config endpoint for every business unit.
+
+        With an async client all business unit x endpoint calls run concurrently,
+        at most max_concurrent at a time.
+        """
         self.config_data = {"bus": []}
+        self.config_meta = {}
         client = self.get_client()
 
         if client:
-            bus_list_res = (
-                await client.get_all_business_units()
-                if self.client.set_async
-                else client.get_all_business_units()
-            )
-            bus_list = bus_list_res["Result"]
+            bus_list = await self._fetch_business_units(client)
+            selected_bus = []
             for bu in bus_list:
                 bu_name = bu["Name"] if bu["Name"] not in exclude_bu_names else None
 
                 if bu_name is None:
                     continue
 
-                bu_id = bu["Id"]
                 self.config_data["bus"].append(bu)
                 self.config_data[bu_name] = {}
-                print(f"Fetching config data for {bu_name}...")
-
-                api_methods = [
-                    "get_all_sites",
-                    "get_all_teams",
-                    "get_all_skills",
-                    "get_all_shift_bags",
-                    "get_all_budget_groups",
-                    "get_all_absences",
-                    "get_all_activities",
-                    "get_all_contracts",
-                    "get_all_contract_schedules",
-                    "get_all_workflow_control_sets",
-                    "get_all_part_time_percentages",
-                    "get_all_shift_categories",
-                    "get_all_scenarios",
-                    "get_all_roles",
-                    "get_all_optional_column",
-                ]
+                selected_bus.append(bu)
 
-                for method_name in api_methods:
-                    api_method = getattr(client, method_name)
-                    config_key = method_name.split("get_all_")[
-                        1
-                    ]  # Get the config key name
-                    self.config_data[bu_name][config_key] = (
-                        await api_method(bu_id)
-                        if self.client.set_async
-                        else api_method(bu_id)
-                    )
+            print(f"Fetching config data for {[bu['Name'] for bu in selected_bus]}...")
+            jobs = [
+                (bu, method_name)
+                for bu in selected_bus
+                for method_name in CONFIG_API_METHODS
+            ]
+            fetched_at = time.time()
+            results = await self._fetch_config_entries(client, jobs, max_concurrent)
+            for (bu, method_name), result in zip(jobs, results):
+                self._store_config_entry(bu["Name"], method_name, result, fetched_at)
 
             if self.config_path:
                 # Save to file
-                with open(self.config_path, "w") as file:
-                    json.dump(self.config_data, file)
+                self.save_config()
 
             return self.config_data
 
+    async def refresh_config(self, max_age=3600, exclude_bu_names=[], max_concurrent=20):
+        """
+        Refetch only the config entries older than max_age seconds.
+
+        Business units added since the last fetch are fetched in full and removed ones
+        are dropped. Returns {bu_name: [entity types whose content changed]}, which
+        includes every entity type of added and removed business units.
+        """
+        if self.config_data is None:
+            if self.config_path:
+                try:
+                    self.load_config()
+                except FileNotFoundError:
+                    pass
+            if self.config_data is None:
+                await self.create_config_from_api(
+                    exclude_bu_names=exclude_bu_names, max_concurrent=max_concurrent
+                )
+                return {
+                    bu["Name"]: list(self.config_data[bu["Name"]].keys())
+                    for bu in self.config_data["bus"]
+                }
+
+        client = self.get_client()
+        changes = {}
+        bus_list = [
+            bu
+            for bu in await self._fetch_business_units(client)
+            if bu["Name"] not in exclude_bu_names
+        ]
+        current_names = {bu["Name"] for bu in bus_list}
+        for bu in self.config_data["bus"]:
+            if bu["Name"] not in current_names:
+                changes[bu["Name"]] = list(self.config_data.pop(bu["Name"], {}).keys())
+                self.config_meta.pop(bu["Name"], None)
+        self.config_data["bus"] = bus_list
+
+        now = time.time()
+        jobs = []
+        for bu in bus_list:
+            self.config_data.setdefault(bu["Name"], {})
+            bu_meta = self.config_meta.get(bu["Name"], {})
+            for method_name in CONFIG_API_METHODS:
+                entry = bu_meta.get(method_name.split("get_all_")[1])
+                if entry is None or now - entry["fetched_at"] >= max_age:
+                    jobs.append((bu, method_name))
+
+        results = await self._fetch_config_entries(client, jobs, max_concurrent)
+        for (bu, method_name), result in zip(jobs, results):
+            if self._store_config_entry(bu["Name"], method_name, result, now):
+                changes.setdefault(bu["Name"], []).append(
+                    method_name.split("get_all_")[1]
+                )
+
+        if self.config_path:
+            self.save_config()
+
+        return changes
+
 
 import pandas as pd
 import json
+import time
+import hashlib
 import numpy as np
 import asyncio
 from asyncio import Semaphore
 from tqdm import tqdm
+from .people_snapshot import read_people_snapshot, write_people_snapshot
+from .shared_state import SharedPeopleState
+from .sinks import make_sink
 # from calabrio_api import AddPersonRequest
 
 
+# config key -> (PeopleManager list attribute, id column, name column)
+CONFIG_FRAMES = {
+    "sites": ("sites", "SiteId", "SiteName"),
+    "teams": ("teams", "TeamId", "SiteTeamName"),
+    "contracts": ("contracts", "ContractId", "ContractName"),
+    "absences": ("absences", "AbsenceId", "AbsenceName"),
+    "roles": ("roles", "RoleId", "RoleName"),
+    "contract_schedules": ("contract_schedules", "ContractScheduleId", "ContractScheduleName"),
+    "workflow_control_sets": ("workflow_control_sets", "WorkflowControlSetId", "WorkflowControlSetName"),
+    "part_time_percentages": ("part_time_percentages", "PartTimePercentageId", "PartTimePercentageName"),
+    "shift_bags": ("shift_bags", "ShiftBagId", "ShiftBagName"),
+    "budget_groups": ("budget_groups", "BudgetGroupId", "BudgetGroupName"),
+    "shift_categories": ("shift_categories", "ShiftCategoryId", "ShiftCategoryName"),
+    "scenarios": ("scenarios", "ScenarioId", "ScenarioName"),
+}
+
+# name column -> config entity whose names are its categories in low_memory mode
+CATEGORY_COLUMNS = {
+    "BusinessUnitName": "bus",
+    "SiteName": "sites",
+    "SiteTeamName": "teams",
+    "TeamName": "teams",
+    "ContractName": "contracts",
+    "RoleName": "roles",
+    "AbsenceName": "absences",
+    "ActivityName": "activities",
+    "ShiftCategoryName": "shift_categories",
+    "DayOffName": "day_off_templates",
+}
+
+# onboarding name column -> (config entity, id column) resolved by add_people_by_df
+PERSON_NAME_COLUMNS = [
+    ("TeamName", "teams", "TeamId"),
+    ("ContractName", "contracts", "ContractId"),
+    ("RoleName", "roles", "RoleId"),
+    ("ContractScheduleName", "contract_schedules", "ContractScheduleId"),
+    ("WorkflowControlSetName", "workflow_control_sets", "WorkflowControlSetId"),
+    ("PartTimePercentageName", "part_time_percentages", "PartTimePercentageId"),
+    ("ShiftBagName", "shift_bags", "ShiftBagId"),
+    ("BudgetGroupName", "budget_groups", "BudgetGroupId"),
+]
+
+PERSON_REQUIRED_COLUMNS = [
+    "TimeZoneId",
+    "BusinessUnitId",
+    "FirstName",
+    "LastName",
+    "StartDate",
+    "EmploymentNumber",
+    "TeamId",
+    "ContractId",
+    "ContractScheduleId",
+    "PartTimePercentageId",
+]
+
+
+def to_categoricals(df, config_index):
+    """Store the repeated name columns of df as categoricals shared with config_index."""
+    for column, entity in CATEGORY_COLUMNS.items():
+        if column in df.columns:
+            dtype = config_index.category_dtype(entity, df[column].unique())
+            if df[column].dtype != dtype:
+                df[column] = df[column].astype(dtype)
+    return df
+
+
+def memory_usage_report(frames):
+    """Rows, columns and deep memory usage of each DataFrame in {name: df}."""
+    report = [
+        {
+            "Name": name,
+            "Rows": len(df),
+            "Columns": len(df.columns),
+            "CategoricalColumns": sum(
+                isinstance(dtype, pd.CategoricalDtype) for dtype in df.dtypes
+            ),
+            "MemoryMB": df.memory_usage(deep=True).sum() / 1024**2,
+        }
+        for name, df in frames.items()
+        if isinstance(df, pd.DataFrame)
+    ]
+    return pd.DataFrame(
+        report, columns=["Name", "Rows", "Columns", "CategoricalColumns", "MemoryMB"]
+    )
+
+
+def lookup_join(left, right, on, suffixes=("_x", "_y")):
+    """
+    Left join of a config frame onto left, equivalent to
+    left.merge(right, on=on, how="left") when the keys of right are unique (the first
+    row wins otherwise). Key tuples are encoded once into shared integer codes and the
+    right-hand columns are attached with array takes instead of a hash merge.
+    """
+    right = right.drop_duplicates(subset=on)
+    if len(on) == 1:
+        right_index = pd.Index(right[on[0]])
+        left_keys = pd.Index(left[on[0]])
+    else:
+        right_index = pd.MultiIndex.from_frame(right[on])
+        left_keys = pd.MultiIndex.from_frame(left[on])
+    positions = right_index.get_indexer(left_keys)
+
+    result = left.copy()
+    for column in right.columns:
+        if column in on:
+            continue
+        values = pd.api.extensions.take(
+            right[column].to_numpy(), positions, allow_fill=True
+        )
+        if column in left.columns:
+            result.rename(columns={column: column + suffixes[0]}, inplace=True)
+            column = column + suffixes[1]
+        result[column] = values
+    return result
+
+
+class PeopleIndex:
+    """
+    Dictionary lookups into a people_df. Each index maps the values of one or more
+    columns to row positions and is built on first use with a single groupby:
+
+        index.rows("EmploymentNumber", ["1001", "1002"])
+        index.first(("BusinessUnitName", "EmploymentNumber"), ("Tokyo", "1001"))
+
+    Indices are cached per DataFrame object. They are dropped when the number of rows
+    changes, but editing key values of people_df in place leaves them stale: call
+    reset() (or PeopleManager.reset_people_index()) after such edits.
+    """
+
+    def __init__(self, people_df):
+        self.people_df = people_df
+        self._indices = {}
+        self._length = len(people_df)
+
+    def reset(self):
+        self._indices = {}
+        self._length = len(self.people_df)
+
+    def _index(self, columns):
+        if isinstance(columns, str):
+            columns = (columns,)
+        columns = tuple(columns)
+        if len(self.people_df) != self._length:
+            self.reset()
+        if columns not in self._indices:
+            if not set(columns).issubset(self.people_df.columns):
+                self._indices[columns] = {}
+            else:
+                keys = columns[0] if len(columns) == 1 else list(columns)
+                self._indices[columns] = self.people_df.groupby(
+                    keys, sort=False, observed=True
+                ).indices
+        return self._indices[columns]
+
+    def positions(self, columns, keys):
+        index = self._index(columns)
+        # Repeated keys select their rows once, like an isin filter
+        return [position for key in dict.fromkeys(keys) for position in index.get(key, ())]
+
+    def rows(self, columns, keys):
+        """Rows matching any of keys, in the order of keys (duplicate keys are ignored)."""
+        return self.people_df.iloc[self.positions(columns, keys)]
+
+    def first(self, columns, key):
+        """First row matching key as a Series, or None."""
+        positions = self._index(columns).get(key)
+        if positions is None or len(positions) == 0:
+            return None
+        return self.people_df.iloc[positions[0]]
+
+    def by_employment_number(self, employment_number):
+        return self.first("EmploymentNumber", employment_number)
+
+    def by_person_id(self, person_id):
+        return self.first("PersonId", person_id)
+
+    def by_email(self, email):
+        return self.first("Email", email)
+
+    def by_team(self, bu_name, team_name):
+        team_column = "TeamName" if "TeamName" in self.people_df.columns else "SiteTeamName"
+        return self.rows(("BusinessUnitName", team_column), [(bu_name, team_name)])
+
+
 class PeopleManager:
     """
     This class is used to fetch the people data from the API and merge it with the config data.
     """
 
-    def __init__(self, client, config_data=None):
+    def __init__(self, client, config_data=None, low_memory=False):
         self.config_data = config_data
+        self._config_index = None
+        self.low_memory = low_memory
         if self.config_data is not None:
-            business_units = self.config_data["bus"]
-            self.bus_df = pd.DataFrame(business_units)
-            self.bus_df.columns = ["BusinessUnitId", "BusinessUnitName"]
+            self._build_bus_df()
         self.client = client
         self.business_units = []
         self.people = []
@@ -152,47 +497,100 @@ class PeopleManager:
     async def fetch_config_data(self, exclude_bu_names=[]):
         if self.config_data is None:
             self.config_manager = ConfigManager(self.client)
-            if self.client.set_async:
-                self.config_data = await self.config_manager.create_config_from_api(
-                    exclude_bu_names=exclude_bu_names
-                )
-            else:
-                self.config_data = await self.config_manager.create_config_from_api(
-                    exclude_bu_names=exclude_bu_names
-                )
+            self.config_data = await self.config_manager.create_config_from_api(
+                exclude_bu_names=exclude_bu_names
+            )
+            self._build_bus_df()
 
     async def fetch_business_units(self):
         business_units_res = await self.client.get_all_business_units()
         self.business_units = business_units_res["Result"]
 
-    async def fetch_teams_and_people_as_of_date(self, date, exclude_bu_names=[]):
+    async def fetch_teams_and_people_as_of_date(
+        self, date, exclude_bu_names=[], max_concurrent=20
+    ):
+        """
+        Fetch the people of every team as of date. Teams are queued as soon as their
+        business unit's team list arrives and at most max_concurrent roster requests run
+        at once. Teams that fail are skipped and recorded in self.failed_teams.
+        """
+        people_by_date = await self.fetch_teams_and_people_as_of_dates(
+            [date], exclude_bu_names=exclude_bu_names, max_concurrent=max_concurrent
+        )
+        return people_by_date[date]
+
+    async def fetch_teams_and_people_as_of_dates(
+        self, dates, exclude_bu_names=[], max_concurrent=20
+    ):
+        """
+        Like fetch_teams_and_people_as_of_date for several dates at once: teams are
+        fetched once and every (team, date) roster shares the same max_concurrent
+        workers. Returns {date: people}.
+        """
         if len(self.business_units) == 0:
             await self.fetch_business_units()
 
         self.business_units = [
             bu for bu in self.business_units if bu["Name"] not in exclude_bu_names
         ]
+        dates = list(dict.fromkeys(dates))
+        self.failed_teams = []
+        people_by_date = {date: [] for date in dates}
+        queue = asyncio.Queue()
 
-        all_teams = await asyncio.gather(
-            *[
-                self.client.get_all_teams(bu["Id"])
-                for bu in self.business_units
-                if bu["Name"] not in exclude_bu_names
-            ]
-        )
-        all_teams = [teams["Result"] for teams in all_teams]
-        flatten_all_teams = [team for teams in all_teams for team in teams]
+        async def discover_teams(bu):
+            try:
+                teams = await self.client.get_all_teams(bu["Id"])
+                for team in teams["Result"]:
+                    for date in dates:
+                        queue.put_nowait((bu, team, date))
+            except Exception as e:
+                print(f"Error fetching teams for business unit {bu['Name']}: {e}")
+                self.failed_teams.append(
+                    {
+                        "BusinessUnitName": bu["Name"],
+                        "TeamId": None,
+                        "TeamName": None,
+                        "Date": None,
+                        "Error": str(e),
+                    }
+                )
 
-        all_people = await asyncio.gather(
-            *[
-                self.client.get_people_by_team_id(team["Id"], date)
-                for team in flatten_all_teams
-            ]
-        )
-        all_people = [people["Result"] for people in all_people]
-        flatten_all_people = [person for people in all_people for person in people]
+        async def fetch_people():
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                bu, team, date = item
+                try:
+                    people = await self.client.get_people_by_team_id(team["Id"], date)
+                    people_by_date[date].extend(people["Result"])
+                except Exception as e:
+                    print(f"Error fetching people for team {team.get('Name')} as of {date}: {e}")
+                    self.failed_teams.append(
+                        {
+                            "BusinessUnitName": bu["Name"],
+                            "TeamId": team["Id"],
+                            "TeamName": team.get("Name"),
+                            "Date": date,
+                            "Error": str(e),
+                        }
+                    )
+
+        workers = [asyncio.create_task(fetch_people()) for _ in range(max_concurrent)]
+        try:
+            await asyncio.gather(*[discover_teams(bu) for bu in self.business_units])
+            for _ in workers:
+                queue.put_nowait(None)
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+
+        if self.failed_teams:
+            print(f"Failed to fetch {len(self.failed_teams)} team rosters")
 
-        return flatten_all_people
+        return people_by_date
 
     async def fetch_all_people(
         self,
@@ -201,6 +599,7 @@ class PeopleManager:
         with_ids=True,
         as_df=True,
         exclude_bu_names=[],
+        max_concurrent=20,
     ):
         if self.config_data is None:
             await self.fetch_config_data(
@@ -213,42 +612,34 @@ class PeopleManager:
         if date is None:
             date = pd.to_datetime("today").strftime("%Y-%m-%d")
 
-        # Fetch and process people data as of the given date
-        as_of_date_data = await self.fetch_teams_and_people_as_of_date(
-            date, exclude_bu_names=exclude_bu_names
+        # Fetch people as of the given date, and as of the end of the year if
+        # include_eoy is True, sharing one team list and worker pool
+        dates = [date]
+        if include_eoy:
+            dates.append(pd.to_datetime("today").strftime("%Y-12-31"))
+        people_by_date = await self.fetch_teams_and_people_as_of_dates(
+            dates, exclude_bu_names=exclude_bu_names, max_concurrent=max_concurrent
         )
-        as_of_date_df = pd.DataFrame(as_of_date_data)
-        # Merge data and perform cleanup for as_of_date data
 
-        self.people_df = self.merge_and_clean_data(as_of_date_df)
+        # Merge data and perform cleanup. People present on both dates keep their
+        # as-of-date record.
+        people = self._dedupe_people(people_by_date, dates)
+        self.people_hashes = {
+            person["Id"]: ConfigManager._hash_response(person) for person in people
+        }
+        self.people_df = self.merge_and_clean_data(pd.DataFrame(people))
 
-        # Fetch config and merge with as_of_date data
+        # Fetch config and merge with people data
         [
             self.fetch_config_data_for_business_unit(bu["Name"])
             for bu in self.business_units
         ]
         self.fetch_config_data_as_df()
 
-        # Merge the data for EOY if include_eoy is True
-        if include_eoy:
-            date = pd.to_datetime("today").strftime("%Y-12-31")
-            flatten_all_people_eoy = await self.fetch_teams_and_people_as_of_date(date)
-            all_people_eoy_df = pd.DataFrame(flatten_all_people_eoy)
-
-            # Merge data and perform cleanup for EOY data
-            all_people_eoy_df = self.merge_and_clean_data(all_people_eoy_df)
-
-            # Merge EOY data and drop duplicates
-            all_people_concat_df = pd.concat(
-                [self.people_df, all_people_eoy_df], ignore_index=True
-            )
-            all_people_concat_df.drop_duplicates(
-                subset=["BusinessUnitId", "EmploymentNumber"], inplace=True
-            )
-
         # Merge data and perform necessary operations
-        len(self.people_df)
         self.people_df = self.merge_and_filter_config_data()
+        if self.low_memory:
+            to_categoricals(self.people_df, self.config_index)
 
         # Remove ids if not needed
         if not with_ids:
@@ -276,6 +667,101 @@ class PeopleManager:
 
         return self.people_df
 
+    @staticmethod
+    def _dedupe_people(people_by_date, dates):
+        """Flatten rosters keeping the first record per (BusinessUnitId, EmploymentNumber)."""
+        seen = set()
+        people = []
+        for date in dict.fromkeys(dates):
+            for person in people_by_date[date]:
+                key = (person.get("BusinessUnitId"), person.get("EmploymentNumber"))
+                if key not in seen:
+                    seen.add(key)
+                    people.append(person)
+        return people
+
+    async def sync_people(
+        self, date=None, include_eoy=False, exclude_bu_names=[], max_concurrent=20
+    ):
+        """
+        Incrementally update people_df from fresh team rosters.
+
+        Each person's raw record is hashed and compared with the previous fetch, and only
+        inserted and updated people are merged with the config data. People whose team
+        could not be fetched this time are kept as they were. Falls back to
+        fetch_all_people when there is no previous snapshot with ids.
+
+        Returns {"inserted": df, "updated": df, "removed": df}; removed holds the rows
+        dropped from people_df.
+        """
+        if (
+            self.people_df.empty
+            or "PersonId" not in self.people_df.columns
+            or not getattr(self, "people_hashes", None)
+        ):
+            people_df = await self.fetch_all_people(
+                date=date,
+                include_eoy=include_eoy,
+                exclude_bu_names=exclude_bu_names,
+                max_concurrent=max_concurrent,
+            )
+            empty_df = people_df.iloc[0:0]
+            return {"inserted": people_df, "updated": empty_df, "removed": empty_df}
+
+        if date is None:
+            date = pd.to_datetime("today").strftime("%Y-%m-%d")
+        dates = [date]
+        if include_eoy:
+            dates.append(pd.to_datetime("today").strftime("%Y-12-31"))
+        people_by_date = await self.fetch_teams_and_people_as_of_dates(
+            dates, exclude_bu_names=exclude_bu_names, max_concurrent=max_concurrent
+        )
+        people = self._dedupe_people(people_by_date, dates)
+        hashes = {
+            person["Id"]: ConfigManager._hash_response(person) for person in people
+        }
+
+        old_hashes = self.people_hashes
+        inserted = {pid for pid in hashes if pid not in old_hashes}
+        updated = {
+            pid for pid in hashes if pid in old_hashes and old_hashes[pid] != hashes[pid]
+        }
+
+        # People missing because their team or business unit failed are not removed
+        failed_team_ids = {f["TeamId"] for f in self.failed_teams if f["TeamId"]}
+        failed_bu_names = {
+            f["BusinessUnitName"] for f in self.failed_teams if f["TeamId"] is None
+        }
+        missing = self.people_df[~self.people_df["PersonId"].isin(hashes)]
+        kept = missing["TeamId"].isin(failed_team_ids) | missing[
+            "BusinessUnitName"
+        ].isin(failed_bu_names)
+        for pid in missing[kept]["PersonId"]:
+            hashes[pid] = old_hashes.get(pid)
+        removed_df = missing[~kept]
+
+        changed = [person for person in people if person["Id"] in inserted | updated]
+        if changed:
+            changed_df = self.merge_and_filter_config_data(
+                self.merge_and_clean_data(pd.DataFrame(changed))
+            )
+        else:
+            changed_df = self.people_df.iloc[0:0]
+
+        unchanged_df = self.people_df[
+            ~self.people_df["PersonId"].isin(updated | set(removed_df["PersonId"]))
+        ]
+        self.people_df = pd.concat([unchanged_df, changed_df], ignore_index=True)
+        if self.low_memory:
+            to_categoricals(self.people_df, self.config_index)
+        self.people_hashes = hashes
+
+        return {
+            "inserted": changed_df[changed_df["PersonId"].isin(inserted)],
+            "updated": changed_df[changed_df["PersonId"].isin(updated)],
+            "removed": removed_df,
+        }
+
     async def fetch_people_by_employment_numbers(self, employment_numbers, date=None):
         if self.config_data is None:
             await self.fetch_config_data()
@@ -306,109 +792,194 @@ class PeopleManager:
         return people_df
 
     def fetch_config_data_as_df(self):
-        self.sites_df = pd.concat(self.sites)
-        self.sites_df.rename(columns={"Id": "SiteId", "Name": "SiteName"}, inplace=True)
+        for key in CONFIG_FRAMES:
+            self._build_config_frame(key)
 
-        self.teams_df = pd.concat(self.teams)
-        self.teams_df.rename(
-            columns={"Id": "TeamId", "Name": "SiteTeamName"}, inplace=True
-        )
+    def _build_config_frame(self, key):
+        list_attr, id_col, name_col = CONFIG_FRAMES[key]
+        config_df = pd.concat(getattr(self, list_attr))
+        config_df.rename(columns={"Id": id_col, "Name": name_col}, inplace=True)
+        setattr(self, f"{list_attr}_df", config_df)
+        return config_df
 
-        self.contracts_df = pd.concat(self.contracts)
-        self.contracts_df.rename(
-            columns={"Id": "ContractId", "Name": "ContractName"}, inplace=True
-        )
+    def fetch_config_data_for_business_unit(self, bu_name):
+        for key, (list_attr, _, _) in CONFIG_FRAMES.items():
+            self.fetch_config(getattr(self, list_attr), key, bu_name)
 
-        self.absences_df = pd.concat(self.absences)
-        self.absences_df.rename(
-            columns={"Id": "AbsenceId", "Name": "AbsenceName"}, inplace=True
-        )
+    def _build_bus_df(self):
+        self.bus_df = pd.DataFrame(self.config_data["bus"])
+        self.bus_df.columns = ["BusinessUnitId", "BusinessUnitName"]
 
-        self.roles_df = pd.concat(self.roles)
-        self.roles_df.rename(columns={"Id": "RoleId", "Name": "RoleName"}, inplace=True)
+    @property
+    def people_df(self):
+        return self._people_df
 
-        self.contract_schedules_df = pd.concat(self.contract_schedules)
-        self.contract_schedules_df.rename(
-            columns={"Id": "ContractScheduleId", "Name": "ContractScheduleName"},
-            inplace=True,
-        )
+    @people_df.setter
+    def people_df(self, people_df):
+        self._people_df = people_df
+        self._people_index = None
 
-        self.workflow_control_sets_df = pd.concat(self.workflow_control_sets)
-        self.workflow_control_sets_df.rename(
-            columns={"Id": "WorkflowControlSetId", "Name": "WorkflowControlSetName"},
-            inplace=True,
-        )
+    @property
+    def people_index(self):
+        """
+        PeopleIndex over people_df, rebuilt after people_df is replaced. Call
+        reset_people_index() after changing key columns of people_df in place.
+        """
+        if getattr(self, "_people_index", None) is None:
+            self._people_index = PeopleIndex(self.people_df)
+        return self._people_index
 
-        self.part_time_percentages_df = pd.concat(self.part_time_percentages)
-        self.part_time_percentages_df.rename(
-            columns={"Id": "PartTimePercentageId", "Name": "PartTimePercentageName"},
-            inplace=True,
-        )
+    def reset_people_index(self):
+        self._people_index = None
 
-        self.shift_bags_df = pd.concat(self.shift_bags)
-        self.shift_bags_df.rename(
-            columns={"Id": "ShiftBagId", "Name": "ShiftBagName"}, inplace=True
-        )
+    def save_people_snapshot(self, root, date=None):
+        """
+        Save people_df under root/date as Parquet partitioned by BusinessUnitName
+        (pip install calabrio-py[parquet]). Returns the snapshot metadata.
+        """
+        if date is None:
+            date = pd.to_datetime("today").strftime("%Y-%m-%d")
+        return write_people_snapshot(root, self.people_df, date)
 
-        self.budget_groups_df = pd.concat(self.budget_groups)
-        self.budget_groups_df.rename(
-            columns={"Id": "BudgetGroupId", "Name": "BudgetGroupName"}, inplace=True
+    def load_people_snapshot(
+        self, root, date=None, columns=None, bu_names=None, max_age=None
+    ):
+        """
+        Load a snapshot saved with save_people_snapshot, reading only the given columns
+        and business units. date defaults to the latest snapshot. A full load (no
+        columns or bu_names) also replaces people_df; partial loads are only returned.
+        Returns None, leaving people_df unchanged, when there is none or it is older
+        than max_age seconds.
+        """
+        people_df = read_people_snapshot(
+            root, date=date, columns=columns, bu_names=bu_names, max_age=max_age
         )
+        if people_df is not None:
+            if self.low_memory and self.config_data is not None:
+                to_categoricals(people_df, self.config_index)
+            if columns is None and bu_names is None:
+                self.people_df = people_df
+        return people_df
 
-        self.shift_categories_df = pd.concat(self.shift_categories)
-        self.shift_categories_df.rename(
-            columns={"Id": "ShiftCategoryId", "Name": "ShiftCategoryName"}, inplace=True
+    async def load_or_fetch_people(
+        self, root, max_age=3600, date=None, columns=None, bu_names=None, **kwargs
+    ):
+        """
+        Load the snapshot for date if it is at most max_age seconds old; otherwise
+        fetch_all_people(date, **kwargs), save a new snapshot and return the requested
+        columns and business units of it.
+        """
+        if date is None:
+            date = pd.to_datetime("today").strftime("%Y-%m-%d")
+        people_df = self.load_people_snapshot(
+            root, date=date, columns=columns, bu_names=bu_names, max_age=max_age
         )
+        if people_df is not None:
+            return people_df
+
+        people_df = await self.fetch_all_people(date=date, **kwargs)
+        self.save_people_snapshot(root, date)
+        if bu_names is not None:
+            people_df = people_df[people_df["BusinessUnitName"].isin(bu_names)]
+        if columns is not None:
+            people_df = people_df[[c for c in columns if c in people_df.columns]]
+        return people_df
 
-        self.scenarios_df = pd.concat(self.scenarios)
-        self.scenarios_df.rename(
-            columns={"Id": "ScenarioId", "Name": "ScenarioName"}, inplace=True
+    def export_shared(self, columns=None):
+        """
+        Copy people_df (only the given columns, if any) and the config DataFrames into
+        shared memory as Arrow tables (pip install calabrio-py[parquet]). Pass
+        state.handle() to worker processes instead of the manager, and close the
+        returned SharedPeopleState when the workers are done.
+        """
+        people_df = self.people_df if columns is None else self.people_df[columns]
+        frames = {"people_df": people_df}
+        for name in ["bus_df"] + [f"{attr}_df" for attr, _, _ in CONFIG_FRAMES.values()]:
+            if isinstance(getattr(self, name, None), pd.DataFrame):
+                frames[name] = getattr(self, name)
+        return SharedPeopleState(frames)
+
+    def memory_usage_report(self):
+        """Memory used by people_df and the config DataFrames, in MB."""
+        frames = {"people_df": self.people_df}
+        frames.update(
+            (f"{list_attr}_df", getattr(self, f"{list_attr}_df", None))
+            for list_attr, _, _ in CONFIG_FRAMES.values()
         )
-
-    def fetch_config_data_for_business_unit(self, bu_name):
-        self.fetch_config(self.sites, "sites", bu_name)
-        self.fetch_config(self.teams, "teams", bu_name)
-        self.fetch_config(self.absences, "absences", bu_name)
-        self.fetch_config(self.contracts, "contracts", bu_name)
-        self.fetch_config(self.roles, "roles", bu_name)
-        self.fetch_config(self.contract_schedules, "contract_schedules", bu_name)
-        self.fetch_config(self.workflow_control_sets, "workflow_control_sets", bu_name)
-        self.fetch_config(self.part_time_percentages, "part_time_percentages", bu_name)
-        self.fetch_config(self.shift_bags, "shift_bags", bu_name)
-        self.fetch_config(self.budget_groups, "budget_groups", bu_name)
-        self.fetch_config(self.shift_categories, "shift_categories", bu_name)
-        self.fetch_config(self.scenarios, "scenarios", bu_name)
+        return memory_usage_report(frames)
+
+    @property
+    def config_index(self):
+        """ConfigIndex over config_data, rebuilt when config_data is replaced or refreshed."""
+        index = getattr(self, "_config_index", None)
+        if index is None or self._config_index_source is not self.config_data:
+            index = self._config_index = ConfigIndex(self.config_data)
+            self._config_index_source = self.config_data
+        return index
+
+    async def refresh_config_data(self, max_age=3600, exclude_bu_names=[]):
+        """
+        Refresh stale config entries and rebuild only the config DataFrames whose
+        entity type changed. Returns the change report of ConfigManager.refresh_config.
+        """
+        if getattr(self, "config_manager", None) is None:
+            self.config_manager = ConfigManager(self.client)
+            self.config_manager.config_data = self.config_data
+        changes = await self.config_manager.refresh_config(
+            max_age=max_age, exclude_bu_names=exclude_bu_names
+        )
+        self.config_data = self.config_manager.config_data
+        self._build_bus_df()
+        if changes:
+            self._config_index = None
+
+        changed_keys = {key for keys in changes.values() for key in keys}
+        bu_names = [bu["Name"] for bu in self.config_data["bus"]]
+        for key in CONFIG_FRAMES:
+            if key in changed_keys and getattr(self, f"{CONFIG_FRAMES[key][0]}_df", None) is not None:
+                list_attr = CONFIG_FRAMES[key][0]
+                setattr(self, list_attr, [])
+                for bu_name in bu_names:
+                    self.fetch_config(getattr(self, list_attr), key, bu_name)
+                self._build_config_frame(key)
+        return changes
 
     def fetch_config(self, data_list, key, bu_name):
         data_to_add = pd.DataFrame(self.config_data[bu_name][key]["Result"])
         data_to_add["BusinessUnitName"] = bu_name
         data_list.append(data_to_add)
 
-    def merge_and_filter_config_data(self):
-        self.people_df["BusinessUnitName"] = self.people_df["BusinessUnitName"].astype(
-            str
-        )
-        self.people_df["RoleId"] = self.people_df["Roles"].apply(
-            lambda x: self.get_first_role_id(x)
+    def merge_and_filter_config_data(self, people_df=None):
+        """
+        Merge config names into people_df. Without an argument self.people_df is merged
+        and replaced; otherwise the given rows are merged and returned.
+        """
+        in_place = people_df is None
+        if in_place:
+            people_df = self.people_df
+        people_df["BusinessUnitName"] = people_df["BusinessUnitName"].astype(str)
+        # First role of each person; missing or empty role lists give NaN
+        first_roles = (
+            people_df["Roles"].str[0]
+            if len(people_df) and people_df["Roles"].dtype == object
+            else None
         )
+        # .str[0] gives an all-NaN float Series when every role list is empty
+        if first_roles is not None and first_roles.dtype == object:
+            people_df["RoleId"] = first_roles.str.get("RoleId")
+        else:
+            people_df["RoleId"] = None
 
-        tmp_df = self.people_df.merge(
-            self.sites_df, on=["SiteId", "BusinessUnitName"], how="left"
-        )
-        tmp_df = tmp_df.merge(
-            self.teams_df,
-            on=["TeamId", "SiteId", "SiteName", "BusinessUnitName"],
-            how="left",
-        )
-        tmp_df = tmp_df.merge(
-            self.contracts_df, on=["ContractId", "BusinessUnitName"], how="left"
+        tmp_df = lookup_join(people_df, self.sites_df, ["SiteId", "BusinessUnitName"])
+        tmp_df = lookup_join(
+            tmp_df, self.teams_df, ["TeamId", "SiteId", "SiteName", "BusinessUnitName"]
         )
-        tmp_df = tmp_df.merge(
-            self.roles_df, on=["RoleId", "BusinessUnitName"], how="left"
-        )
-        self.people_df = tmp_df
+        tmp_df = lookup_join(tmp_df, self.contracts_df, ["ContractId", "BusinessUnitName"])
+        tmp_df = lookup_join(tmp_df, self.roles_df, ["RoleId", "BusinessUnitName"])
+        if in_place:
+            self.people_df = tmp_df
 
-        return self.people_df
+        return tmp_df
 
     def get_first_role_id(self, role_list):
         if len(role_list) > 0:
@@ -416,115 +987,158 @@ class PeopleManager:
         else:
             return None
 
-    async def add_people_by_df(self, people_df):
-        log = []
+    def _name_lookup_df(self, entity, name_col, id_col):
+        records = self.config_index.records(entity)
+        lookup_df = pd.DataFrame(records, columns=["BusinessUnitName", "Name", "Id"])
+        return lookup_df.rename(columns={"Name": name_col, "Id": id_col})
 
-        # Define columns to merge and their corresponding DataFrame
-        merge_columns = [
-            ("TeamName", "BusinessUnitName", self.teams_df, "TeamId"),
-            ("ContractName", "BusinessUnitName", self.contracts_df, "ContractId"),
-            ("RoleName", "BusinessUnitName", self.roles_df, "RoleId"),
-            ("BusinessUnitName", None, self.bus_df, "BusinessUnitId"),
-            (
-                "ContractScheduleName",
-                "BusinessUnitName",
-                self.contract_schedules_df,
-                "ContractScheduleId",
-            ),
-            (
-                "WorkflowControlSetName",
-                "BusinessUnitName",
-                self.workflow_control_sets_df,
-                "WorkflowControlSetId",
-            ),
-            (
-                "PartTimePercentageName",
+    def resolve_people_df(self, people_df):
+        """
+        Resolve the name columns of an onboarding frame (BusinessUnitName, TeamName,
+        ContractName, ...) to the IDs AddPerson needs. IDs already present are kept.
+
+        Returns (resolved_df, report). report lists one row per problem: a name that
+        matches nothing in its business unit, or a missing required field.
+        """
+        resolved_df = people_df.reset_index(drop=True).copy()
+        problems = []
+
+        def report(mask, column, error):
+            for row, value in resolved_df.loc[mask, column].items():
+                problems.append((row, column, value, error))
+
+        if "BusinessUnitName" in resolved_df.columns:
+            bu_ids = resolved_df["BusinessUnitName"].map(
+                self.config_index.business_unit_ids
+            )
+            if "BusinessUnitId" in resolved_df.columns:
+                bu_ids = resolved_df["BusinessUnitId"].fillna(bu_ids)
+            resolved_df["BusinessUnitId"] = bu_ids
+            report(
+                resolved_df["BusinessUnitName"].notna() & bu_ids.isna(),
                 "BusinessUnitName",
-                self.part_time_percentages_df,
-                "PartTimePercentageId",
-            ),
-            # Add more merge columns as needed
-        ]
+                "Unknown business unit",
+            )
 
-        # Create dictionaries to store lookup values and their IDs
-        lookup_dicts = {}
-
-        # Batch the lookup operations
-        for col1, col2, df, id_col in merge_columns:
-            if id_col not in people_df.columns:
-                if col1 in people_df.columns:
-                    lookup_values = people_df[col1].unique()
-                    if col2:
-                        lookup_values_with_bu = people_df[
-                            [col1, col2]
-                        ].drop_duplicates()
-                        for _, row in lookup_values_with_bu.iterrows():
-                            lookup_values = lookup_values.append(
-                                df[(df[col1] == row[col1]) & (df[col2] == row[col2])][
-                                    id_col
-                                ]
-                            )
-                    else:
-                        lookup_values = people_df[col1].unique()
-                    lookup_dicts[(col1, col2)] = dict(
-                        zip(lookup_values, df.set_index(col1)[id_col])
-                    )
-                    people_df[id_col] = people_df.apply(
-                        lambda x: lookup_dicts[(col1, col2)].get(x[col1])
-                        if pd.notna(x[col1])
-                        else None,
-                        axis=1,
-                    )
+            for name_col, entity, id_col in PERSON_NAME_COLUMNS:
+                if name_col not in resolved_df.columns:
+                    continue
+                lookup_df = self._name_lookup_df(entity, name_col, id_col)
+                ids = lookup_join(
+                    resolved_df[["BusinessUnitName", name_col]],
+                    lookup_df,
+                    ["BusinessUnitName", name_col],
+                )[id_col]
+                if id_col in resolved_df.columns:
+                    ids = resolved_df[id_col].fillna(ids)
+                resolved_df[id_col] = ids
+                report(
+                    resolved_df[name_col].notna() & ids.isna(),
+                    name_col,
+                    f"Unknown {entity} name in business unit",
+                )
 
-        # Loop through records and add people
-        for person in people_df.to_dict(orient="records"):
-            try:
-                # Create the person request
-                person_request = {
-                    "TimeZoneId": person["TimeZoneId"],
-                    "BusinessUnitId": person["BusinessUnitId"],
-                    "FirstName": person["FirstName"],
-                    "LastName": person["LastName"],
-                    "StartDate": person["StartDate"],
-                    "Email": person["Email"],
-                    "EmploymentNumber": person["EmploymentNumber"],
-                    "ApplicationLogon": person["ApplicationLogon"],
-                    "Identity": person["Identity"],
-                    "TeamId": person["TeamId"],
-                    "ContractId": person["ContractId"],
-                    "ContractScheduleId": person["ContractScheduleId"],
-                    "PartTimePercentageId": person["PartTimePercentageId"],
-                    "RoleIds": [person["RoleId"]] if person["RoleId"] else [],
-                    "WorkflowControlSetId": person["WorkflowControlSetId"]
-                    if "WorkflowControlSetId" in person
-                    else "",
-                    "ShiftBagId": person["ShiftBagId"]
-                    if "ShiftBagId" in person
-                    else "",
-                    "BudgetGroupId": person["BudgetGroupId"]
-                    if "BudgetGroupId" in person
-                    else "",
-                    "FirstDayOfWeek": person["FirstDayOfWeek"]
-                    if "FirstDayOfWeek" in person
-                    else 1,
-                    "Culture": person["Culture"] if "Culture" in person else "",
-                }
+        for column in PERSON_REQUIRED_COLUMNS:
+            if column not in resolved_df.columns:
+                resolved_df[column] = None
+            report(resolved_df[column].isna(), column, "Missing required value")
 
-                print(person_request)
+        report_df = pd.DataFrame(problems, columns=["Row", "Column", "Value", "Error"])
+        if "EmploymentNumber" in resolved_df.columns:
+            report_df.insert(
+                1,
+                "EmploymentNumber",
+                resolved_df["EmploymentNumber"].reindex(report_df["Row"]).to_numpy(),
+            )
+        return resolved_df, report_df.sort_values("Row", kind="stable", ignore_index=True)
+
+    @staticmethod
+    def _add_person_request(person):
+        def optional(key, default=""):
+            value = person.get(key)
+            return default if value is None or pd.isna(value) else value
+
+        return {
+            "TimeZoneId": person["TimeZoneId"],
+            "BusinessUnitId": person["BusinessUnitId"],
+            "FirstName": person["FirstName"],
+            "LastName": person["LastName"],
+            "StartDate": person["StartDate"],
+            "Email": optional("Email"),
+            "EmploymentNumber": person["EmploymentNumber"],
+            "ApplicationLogon": optional("ApplicationLogon"),
+            "Identity": optional("Identity"),
+            "TeamId": person["TeamId"],
+            "ContractId": person["ContractId"],
+            "ContractScheduleId": person["ContractScheduleId"],
+            "PartTimePercentageId": person["PartTimePercentageId"],
+            "RoleIds": [person["RoleId"]] if optional("RoleId") else [],
+            "WorkflowControlSetId": optional("WorkflowControlSetId"),
+            "ShiftBagId": optional("ShiftBagId"),
+            "BudgetGroupId": optional("BudgetGroupId"),
+            "FirstDayOfWeek": optional("FirstDayOfWeek", 1),
+            "Culture": optional("Culture"),
+        }
+
+    async def add_people_by_df(self, people_df, max_concurrent=10, as_df=False):
+        """
+        Add every row of people_df as a new person. Names are resolved to IDs with
+        resolve_people_df; rows that fail validation are not submitted and the
+        validation report is kept in self.add_people_report. At most max_concurrent
+        AddPerson commands run at once.
+
+        Returns the log ([time, EmploymentNumber, response or error] per submitted row),
+        or with as_df=True a frame with the Status ("added", "failed" or "invalid") and
+        Result of every row. The frame is also kept in self.add_people_results.
+        """
+        resolved_df, report_df = self.resolve_people_df(people_df)
+        self.add_people_report = report_df
+        invalid_rows = set(report_df["Row"])
+        if invalid_rows:
+            print(
+                f"{len(invalid_rows)} of {len(resolved_df)} people failed validation and will not be added"
+            )
 
-                # Add the person and append the result to the log
-                res = await self.client.add_person(person_request)
-                now = pd.to_datetime("today").strftime("%Y-%m-%d %H:%M:%S")
-                log.append([now, person["EmploymentNumber"], res])
+        semaphore = asyncio.Semaphore(max_concurrent)
 
-            except Exception as e:
-                # Handle the exception here, you can log it or take appropriate action
-                print(f"An error occurred: {str(e)}")
-                # You can choose to raise the exception again if needed
+        async def add_person(person):
+            async with semaphore:
+                try:
+                    res = await self.client.add_person(self._add_person_request(person))
+                    failed = res is None or (isinstance(res, dict) and res.get("Errors"))
+                    status = "failed" if failed else "added"
+                except Exception as e:
+                    print(f"An error occurred adding {person['EmploymentNumber']}: {e}")
+                    res, status = str(e), "failed"
                 now = pd.to_datetime("today").strftime("%Y-%m-%d %H:%M:%S")
-                log.append([now, person["EmploymentNumber"], str(e)])
+                return now, status, res
+
+        people = resolved_df.to_dict(orient="records")
+        rows = [row for row in range(len(people)) if row not in invalid_rows]
+        responses = await asyncio.gather(*[add_person(people[row]) for row in rows])
+        log = [
+            [now, people[row]["EmploymentNumber"], res]
+            for row, (now, _, res) in zip(rows, responses)
+        ]
 
-        return log
+        results = [
+            {
+                "Time": None,
+                "EmploymentNumber": person.get("EmploymentNumber"),
+                "Status": "invalid",
+                "Result": None,
+            }
+            for person in people
+        ]
+        for row, (now, status, res) in zip(rows, responses):
+            results[row].update(Time=now, Status=status, Result=res)
+        for row, errors in report_df.groupby("Row")["Error"]:
+            results[row]["Result"] = "; ".join(errors)
+        self.add_people_results = pd.DataFrame(
+            results, columns=["Time", "EmploymentNumber", "Status", "Result"]
+        )
+
+        return self.add_people_results if as_df else log
 
     async def _switch_person_accessibility(
         self,
@@ -539,7 +1153,7 @@ class PeopleManager:
         now = pd.to_datetime("today").strftime("%Y-%m-%d %H:%M:%S")
 
         try:
-            if remove and (person["TerminationDate"] is not None):
+            if remove and (person.get("TerminationDate") is not None):
                 email = "xxx" + person["Email"] if person["Email"] else None
                 employment_number = (
                     "D" + person["EmploymentNumber"]
@@ -583,26 +1197,38 @@ class PeopleManager:
                 )
                 identity = "---" + person["Identity"] if person["Identity"] else None
             else:
-                print(
+                message = (
                     f"{person['Email']} in {person['BusinessUnitId']} is not terminated"
                 )
+                print(message)
+                return [
+                    now,
+                    person["EmploymentNumber"],
+                    person["Email"],
+                    person,
+                    message,
+                    False,
+                ]
 
-            print(email, employment_number, identity)
-
+            # SetDetailsForPerson replaces every detail, so the others are sent unchanged
             res = await self.client.set_details_for_person(
                 person_id=person["Id"],
+                first_name=person.get("FirstName"),
+                last_name=person.get("LastName"),
                 email=email,
+                workflow_control_set_id=person.get("WorkflowControlSetId"),
+                note=person.get("Note"),
                 employment_number=employment_number,
                 identity=identity,
             )
-            print(res)
+            failed = res is None or (isinstance(res, dict) and res.get("Errors"))
             log_entry = [
                 now,
                 person["EmploymentNumber"],
                 person["Email"],
                 person,
                 res,
-                True,
+                not failed,
             ]
         except Exception as e:
             error_message = f"Error processing person with ID {person['Id']}: {str(e)}"
@@ -617,139 +1243,150 @@ class PeopleManager:
 
         return log_entry
 
-    async def remove_people_by_employment_numbers(self, employment_numbers, date=None):
-        log = []
+    async def switch_people_accessibility(
+        self,
+        employment_numbers,
+        date=None,
+        max_concurrent=10,
+        chunk_size=100,
+        as_df=False,
+        **switch,
+    ):
+        """
+        Bulk executor behind remove/recover/activate/reset_new_people_by_employment_numbers.
+        switch is one of remove=True, recover=True, activate=True or reset_new=True.
+
+        People are looked up in chunks of chunk_size employment numbers and updated with
+        at most max_concurrent lookups or SetDetailsForPerson commands in flight.
+
+        Returns the legacy log, or with as_df=True one row per employment number with
+        Success and Result; employment numbers that were not found are included. A
+        failed lookup marks the employment numbers of its chunk as failed and does not
+        stop the other chunks.
+        """
         if date is None:
             date = pd.to_datetime("today").strftime("%Y-%m-%d")
+        employment_numbers = list(employment_numbers)
+        semaphore = asyncio.Semaphore(max_concurrent)
+        failed_lookups = {}
 
-        people_res = await self.client.get_people_by_employment_numbers(
-            employment_numbers=employment_numbers, date=date
-        )
-        people = people_res["Result"]
-
-        for person in people:
-            try:
-                now = pd.to_datetime("today").strftime("%Y-%m-%d %H:%M:%S")
-                log_entry = await self._switch_person_accessibility(person, remove=True)
-                log.append(
-                    [
-                        now,
-                        person["EmploymentNumber"],
-                        person["Email"],
-                        person,
-                        log_entry,
-                        True,
-                    ]
-                )
-            except Exception as e:
-                log.append(
-                    [now, person["EmploymentNumber"], person["Email"], person, e, False]
-                )
+        async def lookup(chunk):
+            async with semaphore:
+                try:
+                    people_res = await self.client.get_people_by_employment_numbers(
+                        employment_numbers=chunk, date=date
+                    )
+                    if people_res is not None and people_res.get("Result") is not None:
+                        return people_res["Result"]
+                    error = "Lookup failed: no result returned"
+                except Exception as e:
+                    error = f"Lookup failed: {e}"
+            print(f"{error} for {len(chunk)} employment numbers")
+            failed_lookups.update(dict.fromkeys(chunk, error))
+            return []
 
-        return log
+        async def switch_person(person):
+            async with semaphore:
+                return await self._switch_person_accessibility(person, **switch)
 
-    async def recover_people_by_employment_numbers(self, employment_numbers, date=None):
-        log = []
-        if date is None:
-            date = pd.to_datetime("today").strftime("%Y-%m-%d")
+        chunks = [
+            employment_numbers[i : i + chunk_size]
+            for i in range(0, len(employment_numbers), chunk_size)
+        ]
+        people = [
+            person
+            for chunk_people in await asyncio.gather(*[lookup(chunk) for chunk in chunks])
+            for person in chunk_people
+        ]
+        log_entries = await asyncio.gather(*[switch_person(person) for person in people])
+        now = pd.to_datetime("today").strftime("%Y-%m-%d %H:%M:%S")
 
-        people_res = await self.client.get_people_by_employment_numbers(
-            employment_numbers=employment_numbers, date=date
+        if not as_df:
+            log = [
+                [
+                    log_entry[0],
+                    person["EmploymentNumber"],
+                    person["Email"],
+                    person,
+                    log_entry,
+                    log_entry[5],
+                ]
+                for person, log_entry in zip(people, log_entries)
+            ]
+            log += [
+                [now, employment_number, None, None, error, False]
+                for employment_number, error in failed_lookups.items()
+            ]
+            return log
+
+        results = [
+            {
+                "Time": now,
+                "EmploymentNumber": employment_number,
+                "Email": email,
+                "PersonId": person["Id"],
+                "BusinessUnitId": person.get("BusinessUnitId"),
+                "Success": success,
+                "Result": res,
+            }
+            for now, employment_number, email, person, res, success in log_entries
+        ]
+        found = {person["EmploymentNumber"] for person in people}
+        results += [
+            {
+                "Time": now,
+                "EmploymentNumber": employment_number,
+                "Email": None,
+                "PersonId": None,
+                "BusinessUnitId": None,
+                "Success": False,
+                "Result": failed_lookups.get(
+                    employment_number, "Employment number not found"
+                ),
+            }
+            for employment_number in dict.fromkeys(employment_numbers)
+            if employment_number not in found
+        ]
+        return pd.DataFrame(
+            results,
+            columns=[
+                "Time",
+                "EmploymentNumber",
+                "Email",
+                "PersonId",
+                "BusinessUnitId",
+                "Success",
+                "Result",
+            ],
         )
-        people = people_res["Result"]
 
-        for person in people:
-            try:
-                now = pd.to_datetime("today").strftime("%Y-%m-%d %H:%M:%S")
-                log_entry = await self._switch_person_accessibility(
-                    person, recover=True
-                )
-                log.append(
-                    [
-                        now,
-                        person["EmploymentNumber"],
-                        person["Email"],
-                        person,
-                        log_entry,
-                        True,
-                    ]
-                )
-            except Exception as e:
-                log.append(
-                    [now, person["EmploymentNumber"], person["Email"], person, e, False]
-                )
+    async def remove_people_by_employment_numbers(
+        self, employment_numbers, date=None, max_concurrent=10, as_df=False
+    ):
+        return await self.switch_people_accessibility(
+            employment_numbers, date, max_concurrent=max_concurrent, as_df=as_df, remove=True
+        )
 
-        return log
+    async def recover_people_by_employment_numbers(
+        self, employment_numbers, date=None, max_concurrent=10, as_df=False
+    ):
+        return await self.switch_people_accessibility(
+            employment_numbers, date, max_concurrent=max_concurrent, as_df=as_df, recover=True
+        )
 
     async def activate_people_by_employment_numbers(
-        self, employment_numbers, date=None
+        self, employment_numbers, date=None, max_concurrent=10, as_df=False
     ):
-        log = []
-        if date is None:
-            date = pd.to_datetime("today").strftime("%Y-%m-%d")
-
-        people_res = await self.client.get_people_by_employment_numbers(
-            employment_numbers=employment_numbers, date=date
+        return await self.switch_people_accessibility(
+            employment_numbers, date, max_concurrent=max_concurrent, as_df=as_df, activate=True
         )
-        people = people_res["Result"]
-
-        for person in people:
-            try:
-                now = pd.to_datetime("today").strftime("%Y-%m-%d %H:%M:%S")
-                log_entry = await self._switch_person_accessibility(
-                    person, activate=True
-                )
-                log.append(
-                    [
-                        now,
-                        person["EmploymentNumber"],
-                        person["Email"],
-                        person,
-                        log_entry,
-                        True,
-                    ]
-                )
-            except Exception as e:
-                log.append(
-                    [now, person["EmploymentNumber"], person["Email"], person, e, False]
-                )
-
-        return log
 
     async def reset_new_people_by_employment_numbers(
-        self, employment_numbers, date=None
+        self, employment_numbers, date=None, max_concurrent=10, as_df=False
     ):
-        log = []
-        if date is None:
-            date = pd.to_datetime("today").strftime("%Y-%m-%d")
-
-        people_res = await self.client.get_people_by_employment_numbers(
-            employment_numbers=employment_numbers, date=date
+        return await self.switch_people_accessibility(
+            employment_numbers, date, max_concurrent=max_concurrent, as_df=as_df, reset_new=True
         )
-        people = people_res["Result"]
-
-        for person in people:
-            try:
-                now = pd.to_datetime("today").strftime("%Y-%m-%d %H:%M:%S")
-                log_entry = await self._switch_person_accessibility(
-                    person, reset_new=True
-                )
-                log.append(
-                    [
-                        now,
-                        person["EmploymentNumber"],
-                        person["Email"],
-                        person,
-                        log_entry,
-                        True,
-                    ]
-                )
-            except Exception as e:
-                log.append(
-                    [now, person["EmploymentNumber"], person["Email"], person, e, False]
-                )
-
-        return log
 
     async def set_termination_date_by_employment_number(
         self, employment_number, termination_date
@@ -773,9 +1410,7 @@ class PeopleManager:
     async def find_employment_numbers_to_activate_today(self, date=None):
         if date is None:
             date = pd.to_datetime("today").strftime("%Y-%m-%d")
-        people_to_activate = self.people_df[
-            self.people_df["EmploymentStartDate"] == date
-        ]
+        people_to_activate = self.people_index.rows("EmploymentStartDate", [date])
         people_to_activate = people_to_activate[
             people_to_activate["EmploymentNumber"].str.startswith("N")
         ]
@@ -787,11 +1422,11 @@ class PeopleManager:
         """
         This is to know the date to set as the termination date for a person who is starting in another business unit.
         """
-        person = self.people_df[self.people_df["EmploymentNumber"] == employment_number]
-        if len(person) == 0:
+        person = self.people_index.by_employment_number(employment_number)
+        if person is None:
             return f"Employment number {employment_number} not found."
         one_day_before_start_date = pd.to_datetime(
-            person["EmploymentStartDate"].values[0]
+            person["EmploymentStartDate"]
         ) - pd.Timedelta(days=1)
         return one_day_before_start_date.strftime("%Y-%m-%d")
 
@@ -825,6 +1460,29 @@ class PersonAccountsManager:
         data_to_add["BusinessUnitName"] = bu_name
         data_list.append(data_to_add)
 
+    def _people_index_for(self, people_df):
+        people_mgr = getattr(self, "people_mgr", None)
+        if people_mgr is not None and people_df is people_mgr.people_df:
+            return people_mgr.people_index
+        index = getattr(self, "_people_index", None)
+        if index is None or index.people_df is not people_df:
+            index = self._people_index = PeopleIndex(people_df)
+        return index
+
+    @property
+    def people_index(self):
+        return self._people_index_for(self.people_df)
+
+    @property
+    def config_index(self):
+        if getattr(self, "people_mgr", None) is not None:
+            return self.people_mgr.config_index
+        index = getattr(self, "_config_index", None)
+        if index is None or self._config_index_source is not self.config_data:
+            index = self._config_index = ConfigIndex(self.config_data)
+            self._config_index_source = self.config_data
+        return index
+
     async def fetch_config_data_as_df(self, exclude_bu_names=[]):
         await self.fetch_config_data(exclude_bu_names=exclude_bu_names)
         self.absences = []
@@ -837,99 +1495,88 @@ class PersonAccountsManager:
             columns={"Id": "AbsenceId", "Name": "AbsenceName"}, inplace=True
         )
 
-    async def fetch_and_process_chunk(
-        self, client, chunk, date, max_retry, max_concurrent
-    ):
-        semaphore = asyncio.Semaphore(max_concurrent)
-        person_accounts_with_id = []
-
-        async def fetch_single_person_account(business_unit_id, person_id, date):
-            for retry in range(max_retry):
-                try:
-                    person_accounts = await client.get_person_accounts_by_person_id(
-                        business_unit_id, person_id, date
-                    )
-                    # Extract the 'Result' list and add 'PersonId' to each dictionary
-                    results = [
-                        {"PersonId": person_id, **account}
-                        for account in person_accounts.get("Result", [])
-                    ]
-                    return results
-                except Exception as e:
-                    # Handle any exceptions here, e.g., log an error
-                    print(f"Error while processing PersonId {person_id}: {e}")
-                    if retry == max_retry - 1:
-                        return []  # Return an empty list to indicate a failure
-
-                    await asyncio.sleep(10**retry)  # Exponential back-off
-
-        fetch_tasks = [
-            asyncio.ensure_future(
-                fetch_single_person_account(
-                    person_tuple["BusinessUnitId"], person_tuple["PersonId"], date
-                )
+    async def _fetch_single_person_account(self, client, business_unit_id, person_id, date):
+        try:
+            person_accounts = await client.get_person_accounts_by_person_id(
+                business_unit_id, person_id, date
             )
-            for _, person_tuple in chunk.iterrows()
-        ]
-
-        async def process_results():
-            for fetched_account in asyncio.as_completed(fetch_tasks):
-                async with semaphore:
-                    account_data = await fetched_account
-                    if account_data:
-                        person_accounts_with_id.extend(account_data)
-
-        await process_results()
-        return person_accounts_with_id
+            if person_accounts is None:
+                raise Exception("request failed after retries")
+            # Extract the 'Result' list and add 'PersonId' to each dictionary
+            return [
+                {"PersonId": person_id, **account}
+                for account in person_accounts.get("Result", [])
+            ]
+        except Exception as e:
+            print(f"Error while processing PersonId {person_id}: {e}")
+            self.failed_person_ids.append(person_id)
+            return []  # Return an empty list to indicate a failure
 
-    async def fetch_person_accounts(
-        self,
-        date=None,
-        people_df=None,
-        client=None,
-        with_id=False,
-        details=False,
-        max_retry=10,
-        max_concurrent=200,
+    async def stream_person_accounts(
+        self, people_df, date, client=None, max_concurrent=200
     ):
-        if people_df is None:
-            people_df = self.people_df
-
-        people_df["BusinessUnitId"] = people_df["BusinessUnitId"].astype(str)
-
+        """
+        Fetch the person accounts of every row of people_df (BusinessUnitId, PersonId)
+        with a pool of max_concurrent workers pulling from one queue, and yield
+        (person_id, accounts) as soon as each person completes. A slow person only
+        occupies its own worker. Failed people yield an empty list and are recorded
+        in self.failed_person_ids, which is reset when the stream starts. An error that
+        kills a worker is re-raised here.
+        """
         if client is None:
             client = self.client
+        self.failed_person_ids = []
 
-        if date is None:
-            date = pd.to_datetime("today").strftime("%Y-%m-%d")
-
-        person_accounts_with_id = []
-
-        # Split people_df into chunks
-        chunk_size = 200
-        num_chunks = len(people_df) // chunk_size + 1
-
-        # Create a tqdm object outside the loop
-        progress_bar = tqdm(total=num_chunks, desc="Processing Chunks")
+        jobs = asyncio.Queue()
+        for job in zip(people_df["BusinessUnitId"], people_df["PersonId"]):
+            jobs.put_nowait(job)
+        total = jobs.qsize()
+        # Bounded so that workers pause when the consumer falls behind
+        results = asyncio.Queue(maxsize=max(1, max_concurrent) * 2)
 
-        for chunk_index in range(num_chunks):
-            chunk_start = chunk_index * chunk_size
-            chunk_end = (chunk_index + 1) * chunk_size
-            chunk = people_df.iloc[chunk_start:chunk_end]
+        async def worker():
+            try:
+                while True:
+                    try:
+                        business_unit_id, person_id = jobs.get_nowait()
+                    except asyncio.QueueEmpty:
+                        return
+                    accounts = await self._fetch_single_person_account(
+                        client, business_unit_id, person_id, date
+                    )
+                    await results.put((person_id, accounts))
+            except Exception as e:
+                # Hand the error to the consumer, which would otherwise wait forever
+                await results.put(e)
 
-            # Fetch and process each chunk asynchronously
-            chunk_results = await self.fetch_and_process_chunk(
-                client, chunk, date, max_retry, max_concurrent
-            )
-            person_accounts_with_id.extend(chunk_results)
+        workers = [
+            asyncio.create_task(worker()) for _ in range(min(max_concurrent, total))
+        ]
+        try:
+            for _ in range(total):
+                result = await results.get()
+                if isinstance(result, Exception):
+                    raise result
+                yield result
+        finally:
+            for task in workers:
+                task.cancel()
 
-            # Update the progress bar for each chunk processed
-            progress_bar.update(1)
+    async def fetch_and_process_chunk(
+        self, client, chunk, date, max_retry, max_concurrent
+    ):
+        """Fetch the person accounts of a chunk of people."""
+        _warn_ignored_retries("max_retry", max_retry)
+        person_accounts_with_id = []
+        async for _, accounts in self.stream_person_accounts(
+            chunk, date, client=client, max_concurrent=max_concurrent
+        ):
+            person_accounts_with_id.extend(accounts)
+        return person_accounts_with_id
 
-        person_accounts_df = pd.DataFrame(person_accounts_with_id)
-        if len(person_accounts_df) == 0:
-            print("No person accounts found for the given date")
-            return pd.DataFrame()
+    def _process_person_accounts(self, person_accounts, people_df, with_id, details):
+        """Merge person and absence names into raw person accounts and flatten Period."""
+        person_accounts_df = pd.DataFrame(person_accounts)
 
         # using people_df, add peoples' email and employment number to person_accounts on person_id
         person_accounts_df = person_accounts_df.merge(
@@ -945,21 +1592,16 @@ class PersonAccountsManager:
             on="PersonId",
             how="left",
         )
-        # load_config if absences_df is not defined
-        if not hasattr(self, "absences_df"):
-            await self.fetch_config_data()
-            await self.fetch_config_data_as_df()
 
         # merge with absences_df
-
         person_accounts_df = person_accounts_df.merge(
             self.absences_df, on=["AbsenceId", "BusinessUnitName"], how="left"
         )
         person_accounts_df["StartDate"] = pd.to_datetime(
-            person_accounts_df["Period"].apply(lambda x: x["StartDate"])
+            person_accounts_df["Period"].str.get("StartDate")
         )
         person_accounts_df["EndDate"] = pd.to_datetime(
-            person_accounts_df["Period"].apply(lambda x: x["EndDate"])
+            person_accounts_df["Period"].str.get("EndDate")
         )
         person_accounts_df = person_accounts_df.drop(columns=["Period"])
 
@@ -983,6 +1625,92 @@ class PersonAccountsManager:
                 ]
             )
 
+        return person_accounts_df
+
+    async def fetch_person_accounts(
+        self,
+        date=None,
+        people_df=None,
+        client=None,
+        with_id=False,
+        details=False,
+        max_retry=None,
+        max_concurrent=200,
+        sink=None,
+        batch_size=5000,
+    ):
+        """
+        Fetch the person accounts of everyone in people_df (self.people_df by default)
+        merged with person and absence names.
+
+        Without sink the result is returned as one DataFrame. With sink (a .csv, .jsonl
+        or .parquet path, a callable taking a DataFrame, or a Sink) accounts are merged
+        and written in batches of about batch_size as they arrive, so memory stays flat
+        and completed batches survive a failed run; the Sink is returned.
+        """
+        _warn_ignored_retries("max_retry", max_retry)
+        if people_df is None:
+            people_df = self.people_df
+
+        people_df["BusinessUnitId"] = people_df["BusinessUnitId"].astype(str)
+
+        if client is None:
+            client = self.client
+
+        if date is None:
+            date = pd.to_datetime("today").strftime("%Y-%m-%d")
+
+        # load_config if absences_df is not defined
+        if not hasattr(self, "absences_df"):
+            await self.fetch_config_data()
+            await self.fetch_config_data_as_df()
+
+        if sink is not None:
+            sink = make_sink(sink)
+
+        person_accounts_with_id = []
+
+        # One worker pool across all people
+        progress_bar = tqdm(total=len(people_df), desc="Fetching person accounts")
+        try:
+            async for _, accounts in self.stream_person_accounts(
+                people_df, date, client=client, max_concurrent=max_concurrent
+            ):
+                person_accounts_with_id.extend(accounts)
+                progress_bar.update(1)
+                if sink is not None and len(person_accounts_with_id) >= batch_size:
+                    sink.write(
+                        self._process_person_accounts(
+                            person_accounts_with_id, people_df, with_id, details
+                        )
+                    )
+                    person_accounts_with_id = []
+            if sink is not None and person_accounts_with_id:
+                sink.write(
+                    self._process_person_accounts(
+                        person_accounts_with_id, people_df, with_id, details
+                    )
+                )
+        finally:
+            progress_bar.close()
+            if sink is not None:
+                sink.close()
+
+        if self.failed_person_ids:
+            print(
+                f"Person accounts could not be fetched for {len(self.failed_person_ids)} people. See failed_person_ids."
+            )
+
+        if sink is not None:
+            return sink
+
+        if len(person_accounts_with_id) == 0:
+            print("No person accounts found for the given date")
+            return pd.DataFrame()
+
+        person_accounts_df = self._process_person_accounts(
+            person_accounts_with_id, people_df, with_id, details
+        )
         self.person_accounts_df = person_accounts_df
 
         return person_accounts_df
@@ -993,7 +1721,7 @@ class PersonAccountsManager:
         if date is None:
             date = pd.to_datetime("today").strftime("%Y-%m-%d")
 
-        people_df = self.people_df[self.people_df["BusinessUnitName"].isin(bu_names)]
+        people_df = self.people_index.rows("BusinessUnitName", bu_names)
         person_accounts_df = await self.fetch_person_accounts(
             date,
             people_df,
@@ -1046,9 +1774,7 @@ class PersonAccountsManager:
         if date is None:
             date = pd.to_datetime("today").strftime("%Y-%m-%d")
 
-        people_df = self.people_df[
-            self.people_df["EmploymentNumber"].isin(employment_numbers)
-        ]
+        people_df = self.people_index.rows("EmploymentNumber", employment_numbers)
         person_accounts_df = await self.fetch_person_accounts(
             date,
             people_df,
@@ -1088,13 +1814,10 @@ class PersonAccountsManager:
         if not hasattr(self, "people_df"):
             await self.fetch_all_people()
 
-        person_id = self.people_df[
-            (self.people_df["EmploymentNumber"] == employment_number)
-        ]["PersonId"].tolist()[0]
+        person = self.people_index.by_employment_number(employment_number)
+        person_id = person["PersonId"]
 
-        absence_id = self.absences_df[
-            (self.absences_df["AbsenceName"] == absence_name)
-        ]["AbsenceId"].tolist()[0]
+        absence_id = self._absence_id(person["BusinessUnitName"], absence_name)
 
         # find existing person account for this person and absence
         person_accounts = self.fetch_person_accounts_by_employment_numbers(
@@ -1134,15 +1857,20 @@ class PersonAccountsManager:
         )
         return person_accounts
 
+    def _absence_id(self, bu_name, absence_name):
+        absence_id = self.config_index.id_for(bu_name, "absences", absence_name)
+        if absence_id is None:
+            raise ValueError(
+                f"Absence {absence_name!r} not found in business unit {bu_name!r}"
+            )
+        return absence_id
+
     def add_person_id_and_absence_id(self, account, people_df):
-        person_id = people_df[
-            (people_df["BusinessUnitName"] == account["BusinessUnitName"])
-            & (people_df["EmploymentNumber"] == account["EmploymentNumber"])
-        ]["PersonId"].tolist()[0]
-        absence_id = self.absences_df[
-            (self.absences_df["BusinessUnitName"] == account["BusinessUnitName"])
-            & (self.absences_df["AbsenceName"] == account["AbsenceName"])
-        ]["AbsenceId"].tolist()[0]
+        person_id = self._people_index_for(people_df).first(
+            ("BusinessUnitName", "EmploymentNumber"),
+            (account["BusinessUnitName"], account["EmploymentNumber"]),
+        )["PersonId"]
+        absence_id = self._absence_id(account["BusinessUnitName"], account["AbsenceName"])
         account["PersonId"] = person_id
         account["AbsenceId"] = absence_id
         return account
@@ -1165,16 +1893,9 @@ class PersonAccountsManager:
     async def adhoc_update_person_account_by_employment_number(
         self, employment_number, absence_name, date_from, balance_in, extra, accrued
     ):
-        person_id = self.people_df[
-            self.people_df["EmploymentNumber"] == employment_number
-        ]["PersonId"].iloc[0]
-        bu_name = self.people_df[
-            self.people_df["EmploymentNumber"] == employment_number
-        ]["BusinessUnitName"].iloc[0]
-        absence_id = self.absences_df[
-            (self.absences_df["AbsenceName"] == absence_name)
-            & (self.absences_df["BusinessUnitName"] == bu_name)
-        ]["AbsenceId"].iloc[0]
+        person = self.people_index.by_employment_number(employment_number)
+        person_id = person["PersonId"]
+        absence_id = self._absence_id(person["BusinessUnitName"], absence_name)
         try:
             res = await self.client.add_or_update_person_account_for_person(
                 person_id, absence_id, date_from, balance_in, extra, accrued
@@ -1186,9 +1907,13 @@ class PersonAccountsManager:
 
 
 class ScheduleManager:
-    def __init__(self, people_mgr, people_df=None, config_data=None):
+    def __init__(self, people_mgr, people_df=None, config_data=None, low_memory=None):
         self.client = people_mgr.client
         self.people_mgr = people_mgr
+        # Defaults to the low_memory setting of people_mgr
+        if low_memory is None:
+            low_memory = getattr(people_mgr, "low_memory", False)
+        self.low_memory = low_memory
         if people_df is None:
             self.people_df = people_mgr.people_df
         else:
@@ -1197,36 +1922,38 @@ class ScheduleManager:
         self.fetch_activities_df()
         self.fetch_absences_df()
 
-    def fetch_activities_df(self):
-        self.activities_df = []
-        for bu in self.people_mgr.bus_df.to_dict("records"):
-            activities = self.people_mgr.config_data[bu["BusinessUnitName"]][
-                "activities"
-            ]["Result"]
-            activities_df = pd.DataFrame(activities)
-            activities_df["BusinessUnitName"] = bu["BusinessUnitName"]
-            self.activities_df.append(activities_df)
-
-        # flatten self.activities_df
-        self.activities_df = pd.concat(self.activities_df)
+    @property
+    def config_index(self):
+        return self.people_mgr.config_index
 
-        return self.activities_df
+    def _compact(self, df):
+        if self.low_memory:
+            to_categoricals(df, self.config_index)
+        return df
 
-    def fetch_absences_df(self):
-        self.absences_df = []
-        for bu in self.people_mgr.bus_df.to_dict("records"):
-            absences = self.people_mgr.config_data[bu["BusinessUnitName"]]["absences"][
-                "Result"
-            ]
-            absences_df = pd.DataFrame(absences)
-            absences_df["BusinessUnitName"] = bu["BusinessUnitName"]
-            self.absences_df.append(absences_df)
+    def memory_usage_report(self):
+        """Memory used by the schedule, activity and absence DataFrames, in MB."""
+        return memory_usage_report(
+            {
+                name: getattr(self, name, None)
+                for name in ("schedules_df", "activities_df", "absences_df")
+            }
+        )
 
-        # flatten self.activities_df
-        self.absences_df = pd.concat(self.absences_df)
+    def fetch_activities_df(self):
+        self.activities_df = pd.DataFrame(self.config_index.records("activities"))
+        return self.activities_df
 
+    def fetch_absences_df(self):
+        self.absences_df = pd.DataFrame(self.config_index.records("absences"))
         return self.absences_df
 
+    def _find_team(self, team_name):
+        """Return (team_id, bu_id) of the first business unit that has a team with this name."""
+        bu_name = self.config_index.bu_names_for("teams", team_name)[0]
+        team_id = self.config_index.id_for(bu_name, "teams", team_name)
+        return team_id, self.config_index.business_unit_id(bu_name)
+
     def copy_first_shift_name(self, row):
         if pd.isna(row["ShiftCategoryId"]) and row["Shift"]:
             return row["Shift"][0]["Name"]
@@ -1269,7 +1996,7 @@ class ScheduleManager:
             # Consolidate schedules into a single DataFrame if needed
             if as_df:
                 if schedules:
-                    return pd.concat(schedules, ignore_index=True)
+                    return self._compact(pd.concat(schedules, ignore_index=True))
                 else:
                     return pd.DataFrame()
             else:
@@ -1289,9 +2016,9 @@ class ScheduleManager:
     ):
         try:
             # Fetch schedules for team
-            employment_numbers = self.people_mgr.people_df[
-                self.people_mgr.people_df["BusinessUnitName"] == bu_name
-            ]["EmploymentNumber"].values
+            employment_numbers = self.people_mgr.people_index.rows(
+                "BusinessUnitName", [bu_name]
+            )["EmploymentNumber"].values
 
             return await self.get_schedule_by_employment_numbers(
                 employment_numbers,
@@ -1307,29 +2034,20 @@ class ScheduleManager:
             return pd.DataFrame()
 
     async def _fetch_schedule_data(
-        self, team_id, bu_id, start_date, end_date, max_retries=3
+        self, team_id, bu_id, start_date, end_date, max_retries=None
     ):
-        retries = 0
-
-        while retries < max_retries:
-            try:
-                schedules_res = await self.client.get_schedule_by_team_id(
-                    bu_id, team_id, start_date, end_date
-                )
-                schedules = schedules_res["Result"]
-                return pd.DataFrame(schedules)
-
-            except Exception as error:
-                print(f"Error occurred (Attempt {retries + 1}/{max_retries}):", error)
-                retries += 1
-                if retries < max_retries:
-                    # Calculate the wait time using exponential backoff (e.g., 2^retry_count seconds)
-                    wait_time = 2**retries
-                    print(f"Retrying in {wait_time} seconds...")
-                    await asyncio.sleep(wait_time)
+        """Schedules of a team as a DataFrame."""
+        _warn_ignored_retries("max_retries", max_retries)
+        try:
+            schedules_res = await self.client.get_schedule_by_team_id(
+                bu_id, team_id, start_date, end_date
+            )
+            schedules = schedules_res["Result"]
+            return pd.DataFrame(schedules)
 
-        print("Maximum number of retries reached. Returning an empty DataFrame.")
-        return pd.DataFrame()
+        except Exception as error:
+            print("Error occurred in _fetch_schedule_data. Returning an empty DataFrame:", error)
+            return pd.DataFrame()
 
     def _process_schedule_dataframe(self, schedules_df, with_ids=False):
         try:
@@ -1405,25 +2123,20 @@ class ScheduleManager:
             if not with_ids:
                 schedules_df.drop(columns=["PersonId", "ShiftCategoryId"], inplace=True)
 
-            return schedules_df
+            return self._compact(schedules_df)
         except Exception as error:
             print("Error occurred in _process_schedule_dataframe:", error)
             return pd.DataFrame()
 
     async def get_schedule_by_team_name(
-        self, team_name, start_date, end_date, with_ids=False, as_df=True, max_retries=3
+        self, team_name, start_date, end_date, with_ids=False, as_df=True, max_retries=None
     ):
+        _warn_ignored_retries("max_retries", max_retries)
         try:
-            teams = self.people_mgr.teams_df
-            team_id = teams[teams["TeamName"] == team_name]["TeamId"].values[0]
-            bu_name = teams[teams["TeamName"] == team_name]["BusinessUnitName"].values[
-                0
-            ]
-            bus = self.people_mgr.bus_df
-            bu_id = bus[bus["BusinessUnitName"] == bu_name]["BusinessUnitId"].values[0]
+            team_id, bu_id = self._find_team(team_name)
 
             schedules_df = await self._fetch_schedule_data(
-                team_id, bu_id, start_date, end_date, max_retries
+                team_id, bu_id, start_date, end_date
             )
 
             if not schedules_df.empty:
@@ -1446,10 +2159,9 @@ class ScheduleManager:
     async def process_schedule_chunk(self, chunk, start_date, end_date):
         schedule_task = {"Result": []}
         # try:
-        person_ids = self.people_mgr.people_df[
-            self.people_mgr.people_df["EmploymentNumber"].isin(chunk)
-        ]["PersonId"].values
-        person_ids = list(person_ids)
+        person_ids = list(
+            self.people_mgr.people_index.rows("EmploymentNumber", chunk)["PersonId"]
+        )
         if len(person_ids) == 0:
             print('No person ids found for the given employment numbers')
             return {"Result":[]}
@@ -1606,8 +2318,8 @@ class ScheduleManager:
             if not schedule_activities:
                 return []
 
-            schedule_activities_df = self.convert_activities_to_dataframe(
-                schedule_activities
+            schedule_activities_df = self._compact(
+                self.convert_activities_to_dataframe(schedule_activities)
             )
             org_info_df = self.people_df[
                 [
@@ -1658,7 +2370,7 @@ class ScheduleManager:
                     "AbsenceId",
                 ]
 
-            schedule_activities_df = schedule_activities_df[cols]
+            schedule_activities_df = self._compact(schedule_activities_df[cols].copy())
 
             if not with_ids:
                 schedule_activities_df.drop(
@@ -1700,47 +2412,27 @@ class ScheduleManager:
         with_ids=False,
         as_df=True,
         with_duration=False,
-        max_retries=3,
+        max_retries=None,
         query=None,
     ):
-        retries = 0
+        """Schedule activities of a team."""
+        _warn_ignored_retries("max_retries", max_retries)
+        try:
+            team_id, bu_id = self._find_team(team_name)
 
-        while retries < max_retries:
-            try:
-                teams = self.people_mgr.teams_df
-                team_id = teams[teams["TeamName"] == team_name]["TeamId"].values[0]
-                bu_name = teams[teams["TeamName"] == team_name][
-                    "BusinessUnitName"
-                ].values[0]
-                bus = self.people_mgr.bus_df
-                bu_id = bus[bus["BusinessUnitName"] == bu_name][
-                    "BusinessUnitId"
-                ].values[0]
-
-                schedules_res = await self.client.get_schedule_by_team_id(
-                    bu_id, team_id, start_date, end_date
-                )
-                schedules = schedules_res["Result"]
-                self.schedules = schedules
+            schedules_res = await self.client.get_schedule_by_team_id(
+                bu_id, team_id, start_date, end_date
+            )
+            schedules = schedules_res["Result"]
+            self.schedules = schedules
 
-                return await self.get_schedule_activities(
-                    schedules, with_ids, as_df, with_duration, query=query
-                )
+            return await self.get_schedule_activities(
+                schedules, with_ids, as_df, with_duration, query=query
+            )
 
-            except Exception as error:
-                print(
-                    f"Error occurred in get_schedule_activities_by_team_name (Attempt {retries + 1}/{max_retries}):",
-                    error,
-                )
-                retries += 1
-                if retries < max_retries:
-                    # Calculate the wait time using exponential backoff (e.g., 2^retry_count seconds)
-                    wait_time = 2**retries
-                    print(f"Retrying in {wait_time} seconds...")
-                    await asyncio.sleep(wait_time)
-
-        print("Maximum number of retries reached. Returning an empty list.")
-        return []
+        except Exception as error:
+            print("Error occurred in get_schedule_activities_by_team_name:", error)
+            return []
 
     async def get_schedule_activities_by_employment_numbers(
         self,
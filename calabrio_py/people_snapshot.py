@@ -0,0 +1,150 @@
+import os
+import json
+import time
+import shutil
+
+PARTITION_COLUMN = "BusinessUnitName"
+META_FILENAME = "_meta.json"
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.dataset
+    except ImportError as e:
+        raise ImportError(
+            "Parquet and Arrow features require pyarrow. Install extras: calabrio_py[parquet]"
+        ) from e
+    return pyarrow
+
+
+def _is_nested(value):
+    return isinstance(value, (list, dict))
+
+
+def _nested_columns(df):
+    """Object columns holding lists or dicts (e.g. Roles), stored as JSON strings."""
+    return [
+        column
+        for column in df.columns
+        if df[column].dtype == object and df[column].map(_is_nested).any()
+    ]
+
+
+def snapshot_dates(root):
+    """Dates of the complete snapshots saved under root, oldest first."""
+    if not os.path.isdir(root):
+        return []
+    return sorted(
+        name
+        for name in os.listdir(root)
+        # In-progress and replaced snapshots are kept under dot-prefixed names
+        if not name.startswith(".")
+        and os.path.isfile(os.path.join(root, name, META_FILENAME))
+    )
+
+
+def read_snapshot_meta(root, date=None):
+    """Metadata of the snapshot for date (the latest one by default), or None."""
+    if date is None:
+        dates = snapshot_dates(root)
+        if not dates:
+            return None
+        date = dates[-1]
+    meta_path = os.path.join(root, date, META_FILENAME)
+    if not os.path.isfile(meta_path):
+        return None
+    with open(meta_path) as file:
+        return json.load(file)
+
+
+def write_people_snapshot(root, people_df, date):
+    """
+    Save people_df under root/date as Parquet partitioned by BusinessUnitName, with a
+    _meta.json recording when it was saved. An existing snapshot for date is replaced.
+
+    The data is written to a hidden directory and renamed into place; _meta.json is
+    written last, so a snapshot only becomes visible once it is complete.
+    """
+    pa = _pyarrow()
+    df = people_df.reset_index(drop=True).copy()
+    json_columns = _nested_columns(df)
+    for column in json_columns:
+        df[column] = df[column].map(
+            lambda value: json.dumps(value, default=str) if _is_nested(value) else None
+        )
+    df[PARTITION_COLUMN] = df[PARTITION_COLUMN].astype(str)
+
+    meta = {
+        "date": str(date),
+        "saved_at": time.time(),
+        "rows": len(df),
+        "columns": list(df.columns),
+        "json_columns": json_columns,
+        "business_units": sorted(df[PARTITION_COLUMN].unique().tolist()),
+    }
+
+    target = os.path.join(root, str(date))
+    tmp_target = os.path.join(root, f".{date}.tmp{os.getpid()}")
+    old_target = os.path.join(root, f".{date}.old{os.getpid()}")
+    shutil.rmtree(tmp_target, ignore_errors=True)
+    pa.dataset.write_dataset(
+        pa.Table.from_pandas(df, preserve_index=False),
+        tmp_target,
+        format="parquet",
+        partitioning=pa.dataset.partitioning(
+            pa.schema([(PARTITION_COLUMN, pa.string())]), flavor="hive"
+        ),
+    )
+    # Unpublish the previous snapshot before its files are swapped out
+    meta_path = os.path.join(target, META_FILENAME)
+    if os.path.exists(meta_path):
+        os.remove(meta_path)
+    if os.path.exists(target):
+        shutil.rmtree(old_target, ignore_errors=True)
+        os.replace(target, old_target)
+    os.replace(tmp_target, target)
+    shutil.rmtree(old_target, ignore_errors=True)
+
+    tmp_meta_path = os.path.join(target, f".{META_FILENAME}.tmp")
+    with open(tmp_meta_path, "w") as file:
+        json.dump(meta, file)
+    os.replace(tmp_meta_path, meta_path)
+    return meta
+
+
+def read_people_snapshot(root, date=None, columns=None, bu_names=None, max_age=None):
+    """
+    Load the snapshot for date (the latest one by default), reading only the given
+    columns and business units. Returns None when there is no snapshot or it was saved
+    more than max_age seconds ago.
+    """
+    pa = _pyarrow()
+    meta = read_snapshot_meta(root, date)
+    if meta is None:
+        return None
+    if max_age is not None and time.time() - meta["saved_at"] > max_age:
+        return None
+
+    if columns is not None:
+        columns = [column for column in columns if column in meta["columns"]]
+    dataset = pa.dataset.dataset(
+        os.path.join(root, meta["date"]),
+        format="parquet",
+        partitioning=pa.dataset.partitioning(
+            pa.schema([(PARTITION_COLUMN, pa.string())]), flavor="hive"
+        ),
+    )
+    row_filter = None
+    if bu_names is not None:
+        row_filter = pa.dataset.field(PARTITION_COLUMN).isin(list(bu_names))
+    df = dataset.to_table(columns=columns, filter=row_filter).to_pandas()
+
+    for column in meta["json_columns"]:
+        if column in df.columns:
+            df[column] = df[column].map(
+                lambda value: json.loads(value) if isinstance(value, str) else value
+            )
+    # Restore the saved column order; the partition column is read back last
+    ordered = [column for column in meta["columns"] if column in df.columns]
+    return df[ordered]
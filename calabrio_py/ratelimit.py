@@ -0,0 +1,157 @@
+import asyncio
+import time
+import logging
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+logger = logging.getLogger('api_client')
+
+THROTTLE_STATUSES = (429, 503)
+
+
+def parse_retry_after(value):
+    """
+    Parse a Retry-After header value into seconds.
+
+    The header is either a number of seconds or an HTTP date. Returns None when the
+    value is missing or cannot be parsed.
+    """
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class AdaptiveRateLimiter:
+    """
+    Client-wide rate limiter shared by every request made through one client.
+
+    Combines a token bucket (rate requests per second, up to burst at once) with an
+    AIMD concurrency window: each successful response grows the window additively,
+    each 429/503 shrinks it multiplicatively. A Retry-After header on a throttled
+    response pauses all callers until the server says it is ready again.
+
+    Leave rate as None to only limit concurrency.
+    """
+
+    def __init__(
+        self,
+        rate=None,
+        burst=None,
+        initial_concurrency=50,
+        min_concurrency=1,
+        max_concurrency=200,
+        increase=1.0,
+        decrease_factor=0.5,
+        default_backoff=1.0,
+        cooldown=1.0,
+    ):
+        self.rate = rate
+        self.burst = burst if burst is not None else (max(1.0, rate) if rate else None)
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.default_backoff = default_backoff
+        self.cooldown = cooldown
+
+        self._limit = float(min(max(initial_concurrency, min_concurrency), max_concurrency))
+        self._tokens = self.burst
+        self._last_refill = time.monotonic()
+        self._blocked_until = 0.0
+        self._last_decrease = 0.0
+        self._in_flight = 0
+        self._waiters = deque()
+        self.throttled_count = 0
+
+    @property
+    def concurrency(self):
+        return max(self.min_concurrency, int(self._limit))
+
+    @property
+    def in_flight(self):
+        return self._in_flight
+
+    def _take_token(self):
+        """Consume a token and return 0, or return the seconds until one is available."""
+        if not self.rate:
+            return 0.0
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return 0.0
+        return (1.0 - self._tokens) / self.rate
+
+    async def acquire(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            delay = self._blocked_until - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+            if self._in_flight < self.concurrency:
+                wait = self._take_token()
+                if wait <= 0:
+                    self._in_flight += 1
+                    return
+                await asyncio.sleep(wait)
+                continue
+            waiter = loop.create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+
+    def acquire_sync(self):
+        """Blocking variant for the sync client: waits out Retry-After pauses and the token bucket."""
+        while True:
+            delay = self._blocked_until - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+                continue
+            wait = self._take_token()
+            if wait <= 0:
+                self._in_flight += 1
+                return
+            time.sleep(wait)
+
+    def release(self, status=None, retry_after=None):
+        self._in_flight = max(0, self._in_flight - 1)
+        if status in THROTTLE_STATUSES:
+            self._on_throttled(parse_retry_after(retry_after))
+        elif status is not None and status < 400:
+            self._limit = min(self.max_concurrency, self._limit + self.increase / self._limit)
+        self._wake_waiters()
+
+    def _on_throttled(self, retry_after):
+        self.throttled_count += 1
+        now = time.monotonic()
+        # Responses already in flight when the server pushed back should not collapse the window again
+        if now - self._last_decrease >= self.cooldown:
+            self._limit = max(self.min_concurrency, self._limit * self.decrease_factor)
+            self._last_decrease = now
+            logger.warning("Throttled by server, reducing concurrency to %d", self.concurrency)
+        pause = retry_after if retry_after is not None else self.default_backoff
+        self._blocked_until = max(self._blocked_until, now + pause)
+
+    def _wake_waiters(self):
+        free = self.concurrency - self._in_flight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
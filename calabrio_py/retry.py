@@ -0,0 +1,106 @@
+import asyncio
+import random
+import time
+import logging
+
+import aiohttp
+import requests
+
+from .ratelimit import parse_retry_after
+
+logger = logging.getLogger('api_client')
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Errors raised before the request reached the server; safe to retry for any endpoint
+CONNECT_ERRORS = (aiohttp.ClientConnectorError, requests.exceptions.ConnectTimeout)
+
+
+class RetryPolicy:
+    """
+    Retry policy shared by the sync and async request paths of ApiClientBase.
+
+    Queries (/query endpoints and GET requests) are idempotent and are retried on any
+    status in retry_statuses and on network errors. Commands (/command endpoints) may
+    already have been applied when the server failed, so they are only retried when
+    the request was rejected outright: statuses in command_retry_statuses (429 by
+    default) or errors raised while connecting.
+
+    Delays use exponential backoff with full jitter, are never shorter than a
+    Retry-After header, and the whole retry sequence stops once total_timeout
+    seconds have elapsed since the first attempt.
+    """
+
+    def __init__(
+        self,
+        max_attempts=5,
+        base_delay=0.5,
+        max_delay=30.0,
+        total_timeout=120.0,
+        retry_statuses=RETRY_STATUSES,
+        command_retry_statuses=(429,),
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.total_timeout = total_timeout
+        self.retry_statuses = tuple(retry_statuses)
+        self.command_retry_statuses = tuple(command_retry_statuses)
+
+    def is_idempotent(self, method, url):
+        if method.upper() == "GET":
+            return True
+        return "/query/" in url
+
+    def backoff(self, attempt):
+        """Full-jitter delay for the given zero-based attempt number."""
+        cap = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return random.uniform(0, cap)
+
+    def next_delay(self, attempt, method, url, started, status=None, error=None, retry_after=None):
+        """
+        Return how long to wait before retrying, or None when the request must not be retried.
+        """
+        if attempt + 1 >= self.max_attempts:
+            return None
+
+        if error is not None:
+            if not (self.is_idempotent(method, url) or isinstance(error, CONNECT_ERRORS)):
+                return None
+        elif self.is_idempotent(method, url):
+            if status not in self.retry_statuses:
+                return None
+        elif status not in self.command_retry_statuses:
+            return None
+
+        delay = self.backoff(attempt)
+        server_delay = parse_retry_after(retry_after)
+        if server_delay is not None:
+            delay = max(delay, server_delay)
+
+        if self.total_timeout is not None:
+            remaining = self.total_timeout - (time.monotonic() - started)
+            if delay > remaining:
+                return None
+        return delay
+
+    async def run(self, func, *args, **kwargs):
+        """
+        Await func(*args, **kwargs), retrying on any exception with the same backoff and
+        budget. Used for manager-level operations that are not a single HTTP call.
+        """
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            try:
+                return await func(*args, **kwargs)
+            except Exception as e:
+                attempt += 1
+                elapsed = time.monotonic() - started
+                if attempt >= self.max_attempts:
+                    raise
+                delay = self.backoff(attempt - 1)
+                if self.total_timeout is not None and elapsed + delay > self.total_timeout:
+                    raise
+                logger.warning("Error: %s. Retrying in %.1f seconds...", e, delay)
+                await asyncio.sleep(delay)
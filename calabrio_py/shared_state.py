@@ -0,0 +1,177 @@
+import json
+from multiprocessing import shared_memory
+
+from .people_snapshot import _is_nested, _nested_columns, _pyarrow
+
+# Attached blocks that could not be closed because their buffers are still in use
+_pinned_blocks = []
+
+
+def _attach(name):
+    # Python 3.13+ can attach without registering the block with the resource tracker
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+class SharedTable:
+    """
+    Handle to a DataFrame stored as an Arrow IPC stream in shared memory. Handles pickle
+    as the block name only, so passing one to a worker process costs a few bytes; the
+    worker maps the block and reads the Arrow columns in place.
+    """
+
+    def __init__(self, name, size, json_columns=()):
+        self.name = name
+        self.size = size
+        self.json_columns = list(json_columns)
+        self._shm = None
+        self._table = None
+
+    def __reduce__(self):
+        return (self.__class__, (self.name, self.size, self.json_columns))
+
+    def table(self):
+        """The Arrow table, backed by the shared memory block (no copy)."""
+        if self._table is None:
+            pa = _pyarrow()
+            self._shm = _attach(self.name)
+            buffer = pa.py_buffer(self._shm.buf)[: self.size]
+            self._table = pa.ipc.open_stream(buffer).read_all()
+        return self._table
+
+    def to_pandas(self, columns=None):
+        table = self.table()
+        if columns is not None:
+            table = table.select([c for c in columns if c in table.column_names])
+        df = table.to_pandas()
+        for column in self.json_columns:
+            if column in df.columns:
+                df[column] = df[column].map(
+                    lambda value: json.loads(value) if isinstance(value, str) else value
+                )
+        return df
+
+    def close(self):
+        """Detach from the block. Arrow tables obtained from table() must not be used afterwards."""
+        self._table = None
+        if self._shm is not None:
+            try:
+                self._shm.close()
+            except BufferError:
+                # DataFrames still reference the Arrow buffers (pandas keeps Arrow-backed
+                # columns zero-copy), so the mapping stays open until the process exits
+                _pinned_blocks.append(self._shm)
+            self._shm = None
+
+
+def share_dataframe(df):
+    """
+    Copy df into a new shared memory block. Returns (SharedMemory, SharedTable); the
+    caller owns the block and must close and unlink it.
+    """
+    pa = _pyarrow()
+    df = df.reset_index(drop=True)
+    json_columns = _nested_columns(df)
+    if json_columns:
+        df = df.copy()
+        for column in json_columns:
+            df[column] = df[column].map(
+                lambda value: json.dumps(value, default=str) if _is_nested(value) else None
+            )
+    table = pa.Table.from_pandas(df, preserve_index=False)
+
+    def write(sink):
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+
+    sizer = pa.MockOutputStream()
+    write(sizer)
+    size = sizer.size()
+    shm = shared_memory.SharedMemory(create=True, size=size)
+    try:
+        write(pa.FixedSizeBufferWriter(pa.py_buffer(shm.buf)))
+    except Exception:
+        shm.close()
+        shm.unlink()
+        raise
+    return shm, SharedTable(shm.name, size, json_columns)
+
+
+class SharedPeopleHandle:
+    """
+    Picklable worker-side view of a SharedPeopleState. Frames are read from shared
+    memory on first access and cached for the life of the handle.
+    """
+
+    def __init__(self, tables):
+        self.tables = tables
+        self._frames = {}
+
+    def __reduce__(self):
+        return (self.__class__, (self.tables,))
+
+    def frame(self, name, columns=None):
+        if columns is not None:
+            return self.tables[name].to_pandas(columns)
+        if name not in self._frames:
+            self._frames[name] = self.tables[name].to_pandas()
+        return self._frames[name]
+
+    @property
+    def people_df(self):
+        return self.frame("people_df")
+
+    def attach_manager(self, client=None):
+        """A PeopleManager with people_df and the config DataFrames set, for post-processing."""
+        from .manager import PeopleManager
+
+        people_mgr = PeopleManager(client)
+        for name in self.tables:
+            setattr(people_mgr, name, self.frame(name))
+        return people_mgr
+
+    def close(self):
+        self._frames.clear()
+        for table in self.tables.values():
+            table.close()
+
+
+class SharedPeopleState:
+    """
+    Shared memory export of people_df and the config DataFrames of a PeopleManager,
+    created with PeopleManager.export_shared(). Pass state.handle() to worker processes.
+    The exporting process owns the blocks: close() (or leaving the with block) frees them.
+    """
+
+    def __init__(self, frames):
+        self._blocks = []
+        self.tables = {}
+        try:
+            for name, df in frames.items():
+                shm, table = share_dataframe(df)
+                self._blocks.append(shm)
+                self.tables[name] = table
+        except Exception:
+            self.close()
+            raise
+
+    def handle(self):
+        return SharedPeopleHandle(dict(self.tables))
+
+    @property
+    def nbytes(self):
+        return sum(table.size for table in self.tables.values())
+
+    def close(self):
+        for shm in self._blocks:
+            shm.close()
+            shm.unlink()
+        self._blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,165 @@
+import os
+
+from .people_snapshot import _pyarrow
+
+
+class Sink:
+    """
+    Destination for DataFrame batches written as a crawl progresses. Subclasses
+    implement _write; rows and batches count what has been written so far.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.batches = 0
+
+    def write(self, df):
+        if len(df) == 0:
+            return
+        self._write(df)
+        self.rows += len(df)
+        self.batches += 1
+
+    def _write(self, df):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class CallbackSink(Sink):
+    """Pass every batch to callback(df)."""
+
+    def __init__(self, callback):
+        super().__init__()
+        self.callback = callback
+
+    def _write(self, df):
+        self.callback(df)
+
+
+class CsvSink(Sink):
+    """Append batches to one CSV file; the header is written with the first batch."""
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self._columns = None
+
+    def _write(self, df):
+        if self._columns is None:
+            self._columns = list(df.columns)
+            df.to_csv(self.path, index=False)
+        else:
+            df.reindex(columns=self._columns).to_csv(
+                self.path, mode="a", header=False, index=False
+            )
+
+
+class JsonlSink(Sink):
+    """Append batches to a JSON Lines file, one record per line."""
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self._mode = "w"
+
+    def _write(self, df):
+        with open(self.path, self._mode) as file:
+            df.to_json(file, orient="records", lines=True, date_format="iso")
+        self._mode = "a"
+
+
+class ParquetSink(Sink):
+    """
+    Write each batch as its own Parquet file (part-00000.parquet, ...) in a directory,
+    so every completed batch stays readable if the run dies. Read the directory back
+    with pandas.read_parquet(path). Requires pyarrow.
+
+    Part files left in the directory by an earlier run are removed when the sink is
+    created. All parts share one schema: a column that is typed for the first time
+    (e.g. all-null in the earlier batches) widens the schema and the earlier parts are
+    rewritten to match.
+    """
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self._schema = None
+        os.makedirs(path, exist_ok=True)
+        for name in os.listdir(path):
+            if name.startswith(("part-", ".part-")) and ".parquet" in name:
+                os.remove(os.path.join(path, name))
+
+    def _part_path(self, index):
+        return os.path.join(self.path, f"part-{index:05d}.parquet")
+
+    def _write_part(self, table, part):
+        import pyarrow.parquet as pq
+
+        # Readers skip files starting with "_" or ".", so an interrupted write is ignored
+        tmp_part = os.path.join(self.path, f".{os.path.basename(part)}.tmp")
+        pq.write_table(table, tmp_part)
+        os.replace(tmp_part, part)
+
+    def _write(self, df):
+        import pyarrow.parquet as pq
+
+        pa = _pyarrow()
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if self._schema is None:
+            self._schema = table.schema.remove_metadata()
+        else:
+            try:
+                schema = pa.unify_schemas(
+                    [self._schema, table.schema.remove_metadata()],
+                    promote_options="permissive",
+                )
+            except TypeError:  # pyarrow < 14 only promotes null columns
+                schema = pa.unify_schemas([self._schema, table.schema.remove_metadata()])
+            if not schema.equals(self._schema):
+                for index in range(self.batches):
+                    part = self._part_path(index)
+                    self._write_part(_conform(pq.read_table(part), schema), part)
+                self._schema = schema
+        self._write_part(_conform(table, self._schema), self._part_path(self.batches))
+
+
+def _conform(table, schema):
+    """table with the fields of schema, in order; missing columns are all-null."""
+    pa = _pyarrow()
+    columns = [
+        table.column(field.name).cast(field.type)
+        if field.name in table.column_names
+        else pa.nulls(table.num_rows, field.type)
+        for field in schema
+    ]
+    return pa.Table.from_arrays(columns, schema=schema)
+
+
+def make_sink(sink):
+    """
+    Sink for a path (.csv, .jsonl/.ndjson, or a .parquet directory), a callable or a
+    Sink instance.
+    """
+    if isinstance(sink, Sink):
+        return sink
+    if callable(sink):
+        return CallbackSink(sink)
+    path = os.fspath(sink)
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return CsvSink(path)
+    if extension in (".jsonl", ".ndjson"):
+        return JsonlSink(path)
+    if extension in (".parquet", ".pq"):
+        return ParquetSink(path)
+    raise ValueError(
+        f"Unsupported sink {sink!r}: use a .csv, .jsonl or .parquet path or a callable"
+    )
@@ -0,0 +1,175 @@
+import os
+import mmap
+import struct
+from collections.abc import MutableMapping
+
+SNAPSHOT_MAGIC = b"CALCFG1\n"
+SNAPSHOT_EXTENSIONS = (".msgpack", ".mpk")
+
+_HEADER_LENGTH = struct.Struct("<Q")
+
+
+def _msgpack():
+    try:
+        import msgpack
+    except ImportError as e:
+        raise ImportError(
+            "Binary config snapshots require msgpack. Install extras: calabrio_py[snapshot]"
+        ) from e
+    return msgpack
+
+
+def is_snapshot_path(path):
+    return os.path.splitext(path)[1].lower() in SNAPSHOT_EXTENSIONS
+
+
+class _Pending:
+    __slots__ = ("load",)
+
+    def __init__(self, load):
+        self.load = load
+
+
+class LazyMapping(MutableMapping):
+    """Dict-like mapping whose values are decoded on first access."""
+
+    def __init__(self, items):
+        self._items = dict(items)
+        self.modified = False
+
+    def __getitem__(self, key):
+        value = self._items[key]
+        if isinstance(value, _Pending):
+            value = self._items[key] = value.load()
+        return value
+
+    def __setitem__(self, key, value):
+        self._items[key] = value
+        self.modified = True
+
+    def __delitem__(self, key):
+        del self._items[key]
+        self.modified = True
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({list(self._items)})"
+
+    def to_dict(self):
+        """Decode everything into plain dicts, e.g. to save the config as JSON."""
+        return {
+            key: value.to_dict() if isinstance(value, LazyMapping) else value
+            for key, value in self.items()
+        }
+
+
+class ConfigSnapshot(LazyMapping):
+    """
+    config_data backed by a memory-mapped snapshot file.
+
+    Behaves like the config_data dict: config["bus"] is the business unit list and
+    config[bu_name][entity] the API response for that entity type. Each entity is
+    decoded from the mapped file only when first accessed, and the mapping pages are
+    shared by every process that opens the same file.
+    """
+
+    def __init__(self, path, items, meta, mapped):
+        super().__init__(items)
+        self.path = path
+        self.meta = meta
+        self._mapped = mapped
+
+    @property
+    def modified(self):
+        return self._modified or any(
+            value.modified
+            for value in self._items.values()
+            if isinstance(value, LazyMapping)
+        )
+
+    @modified.setter
+    def modified(self, value):
+        self._modified = value
+
+    def close(self):
+        self._mapped.close()
+
+    def __reduce__(self):
+        # Worker processes re-map the file instead of receiving a pickled copy
+        if self.modified:
+            return (dict, (self.to_dict(),))
+        return (load_config_snapshot, (self.path,))
+
+
+def write_config_snapshot(path, config_data, config_meta=None):
+    """
+    Write config_data as a snapshot: magic, header length, a msgpack header holding the
+    business unit list, metadata and the offset of every entity, then one msgpack blob
+    per business unit and entity type.
+    """
+    msgpack = _msgpack()
+    blobs = []
+    index = {}
+    offset = 0
+    for bu in config_data["bus"]:
+        bu_name = bu["Name"]
+        index[bu_name] = {}
+        for key, value in config_data[bu_name].items():
+            blob = msgpack.packb(value, use_bin_type=True, default=str)
+            index[bu_name][key] = (offset, len(blob))
+            blobs.append(blob)
+            offset += len(blob)
+
+    header = msgpack.packb(
+        {"bus": list(config_data["bus"]), "meta": config_meta or {}, "index": index},
+        use_bin_type=True,
+        default=str,
+    )
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, "wb") as file:
+        file.write(SNAPSHOT_MAGIC)
+        file.write(_HEADER_LENGTH.pack(len(header)))
+        file.write(header)
+        for blob in blobs:
+            file.write(blob)
+    # Atomic replace so readers never map a half-written file
+    os.replace(tmp_path, path)
+
+
+def load_config_snapshot(path):
+    msgpack = _msgpack()
+    with open(path, "rb") as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    view = memoryview(mapped)
+    if bytes(view[:len(SNAPSHOT_MAGIC)]) != SNAPSHOT_MAGIC:
+        view.release()
+        mapped.close()
+        raise ValueError(f"{path} is not a config snapshot")
+    start = len(SNAPSHOT_MAGIC)
+    (header_length,) = _HEADER_LENGTH.unpack_from(mapped, start)
+    start += _HEADER_LENGTH.size
+    header = msgpack.unpackb(view[start:start + header_length], raw=False)
+    data_start = start + header_length
+    view.release()
+
+    def loader(offset, length):
+        def load():
+            with memoryview(mapped) as blob_view:
+                return msgpack.unpackb(
+                    blob_view[data_start + offset:data_start + offset + length], raw=False
+                )
+
+        return _Pending(load)
+
+    items = {"bus": header["bus"]}
+    for bu_name, entities in header["index"].items():
+        items[bu_name] = LazyMapping(
+            {key: loader(offset, length) for key, (offset, length) in entities.items()}
+        )
+    return ConfigSnapshot(path, items, header["meta"], mapped)
@@ -0,0 +1,162 @@
+import re
+
+_STRUCTURAL = re.compile(rb'["{}\[\],:]')
+_STRING_SPECIAL = re.compile(rb'["\\]')
+
+_QUOTE = ord('"')
+_BACKSLASH = ord('\\')
+_OPEN_OBJECT = ord('{')
+_OPEN_ARRAY = ord('[')
+_CLOSE_OBJECT = ord('}')
+_CLOSE_ARRAY = ord(']')
+_COLON = ord(':')
+_COMMA = ord(',')
+
+
+class ResultStreamParser:
+    """
+    Incremental parser that yields the items of a top-level array (the API's "Result")
+    as soon as each item's bytes have arrived.
+
+    Feed raw response chunks with feed(); each call returns the items completed by that
+    chunk, decoded with the client's codec. Only one item is buffered at a time. Everything
+    outside the array (e.g. "Errors") is kept and returned by close() as the envelope,
+    with the streamed key set to an empty list.
+    """
+
+    def __init__(self, codec, key="Result"):
+        self.codec = codec
+        self.key = key.encode("utf-8")
+        self._buf = bytearray()
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._string_start = None
+        self._last_string = None
+        self._pending_key = None
+        self._in_result = False
+        self._seek_item = False
+        self._item_start = None
+        self._rest = bytearray()
+        self._rest_mark = 0
+
+    def feed(self, chunk):
+        buf = self._buf
+        buf += chunk
+        items = []
+        pos = self._pos
+
+        while True:
+            if self._in_string:
+                m = _STRING_SPECIAL.search(buf, pos)
+                if m is None:
+                    pos = len(buf)
+                    break
+                i = m.start()
+                if buf[i] == _BACKSLASH:
+                    if i + 1 >= len(buf):
+                        # The escaped character is in the next chunk
+                        pos = i
+                        break
+                    pos = i + 2
+                    continue
+                self._in_string = False
+                if self._string_start is not None:
+                    self._last_string = bytes(buf[self._string_start + 1:i])
+                    self._string_start = None
+                pos = i + 1
+                continue
+
+            m = _STRUCTURAL.search(buf, pos)
+            if m is None:
+                if self._in_result and self._depth == 2 and self._seek_item:
+                    # A scalar item may continue into the next chunk
+                    offset = len(buf[pos:]) - len(buf[pos:].lstrip())
+                    if pos + offset < len(buf):
+                        self._item_start = pos + offset
+                        self._seek_item = False
+                pos = len(buf)
+                break
+            i = m.start()
+            c = buf[i]
+
+            if self._in_result and self._depth == 2 and self._seek_item:
+                offset = len(buf[pos:i]) - len(buf[pos:i].lstrip())
+                if pos + offset < i:
+                    self._item_start = pos + offset
+                    self._seek_item = False
+                elif c in (_QUOTE, _OPEN_OBJECT, _OPEN_ARRAY):
+                    self._item_start = i
+                    self._seek_item = False
+
+            if c == _QUOTE:
+                self._in_string = True
+                if self._depth == 1 and not self._in_result:
+                    self._string_start = i
+            elif c == _OPEN_OBJECT or c == _OPEN_ARRAY:
+                if (
+                    c == _OPEN_ARRAY
+                    and self._depth == 1
+                    and not self._in_result
+                    and self._pending_key == self.key
+                ):
+                    self._rest += buf[self._rest_mark:i + 1]
+                    self._in_result = True
+                    self._seek_item = True
+                    self._item_start = None
+                self._depth += 1
+            elif c == _CLOSE_OBJECT or c == _CLOSE_ARRAY:
+                if self._in_result and self._depth == 2:
+                    self._emit(buf, i, items)
+                    self._in_result = False
+                    self._seek_item = False
+                    self._pending_key = None
+                    self._rest_mark = i
+                self._depth -= 1
+            elif c == _COLON:
+                if self._depth == 1 and not self._in_result:
+                    self._pending_key = self._last_string
+            elif c == _COMMA:
+                if self._in_result and self._depth == 2:
+                    self._emit(buf, i, items)
+                    self._seek_item = True
+                elif self._depth == 1:
+                    self._pending_key = None
+            pos = i + 1
+
+        self._pos = pos
+        self._compact()
+        return items
+
+    def _emit(self, buf, end, items):
+        if self._item_start is not None:
+            items.append(self.codec.loads(bytes(buf[self._item_start:end])))
+            self._item_start = None
+
+    def _compact(self):
+        """Drop bytes that are no longer needed so memory stays bounded by one item."""
+        if not self._in_result:
+            self._rest += self._buf[self._rest_mark:self._pos]
+            self._rest_mark = self._pos
+        keep = self._pos
+        for mark in (self._item_start, self._string_start):
+            if mark is not None:
+                keep = min(keep, mark)
+        if keep:
+            del self._buf[:keep]
+            self._pos -= keep
+            self._rest_mark = max(0, self._rest_mark - keep)
+            if self._item_start is not None:
+                self._item_start -= keep
+            if self._string_start is not None:
+                self._string_start -= keep
+
+    def close(self):
+        """Finish parsing and return the decoded envelope. Raises ValueError on truncated input."""
+        if self._in_result or self._in_string or self._depth != 0:
+            raise ValueError("Incomplete JSON document in streamed response")
+        self._rest += self._buf[self._rest_mark:]
+        self._buf = bytearray()
+        if not self._rest.strip():
+            return None
+        return self.codec.loads(bytes(self._rest))
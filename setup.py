@@ -19,4 +19,9 @@ setup(
         'aiohttp>=3.8.3',
         'python-dateutil>=2.8.2'
     ],
+    extras_require={
+        'fast': ['orjson>=3.8'],
+        'snapshot': ['msgpack>=1.0'],
+        'parquet': ['pyarrow>=10'],
+    },
 )
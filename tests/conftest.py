@@ -0,0 +1,25 @@
+import asyncio
+import pytest
+
+
+class ConcurrencyProbe:
+    """Stand-in for request latency in fake clients; records how many calls overlap."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.peak = 0
+        self.calls = 0
+
+    async def request(self, delay):
+        self.in_flight += 1
+        self.calls += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture
+def probe():
+    return ConcurrencyProbe()
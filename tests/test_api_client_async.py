@@ -1,4 +1,5 @@
 import asyncio
+import json
 import types
 import pytest
 from calabrio_py.api import AsyncApiClient
@@ -7,6 +8,7 @@ from calabrio_py.api import AsyncApiClient
 class DummyAiohttpResponse:
     def __init__(self, status=200, payload=None):
         self.status = status
+        self.headers = {}
         self._payload = payload or {"Result": []}  # Errorsキー無しでも動作すること
 
     async def __aenter__(self):
@@ -19,30 +21,120 @@ class DummyAiohttpResponse:
         if self.status >= 400:
             raise Exception(f"HTTP {self.status}")
 
-    async def json(self):
-        return self._payload
+    async def read(self):
+        return json.dumps(self._payload).encode("utf-8")
 
 
 class DummyAiohttpSession:
-    def __init__(self, headers=None):
+    instances = []
+
+    def __init__(self, headers=None, connector=None):
         self.headers = headers or {}
+        self.connector = connector
+        self.closed = False
+        self.requests = []
+        DummyAiohttpSession.instances.append(self)
 
-    async def __aenter__(self):
-        return self
-
-    async def __aexit__(self, exc_type, exc, tb):
-        return False
+    async def close(self):
+        # Yield like a real close, which waits for its connections to shut down
+        await asyncio.sleep(0)
+        self.closed = True
 
     def request(self, method, url, **kwargs):
+        self.requests.append((method, url))
         return DummyAiohttpResponse(200, {"ok": True})
 
 
+@pytest.fixture
+def dummy_aiohttp(monkeypatch):
+    DummyAiohttpSession.instances = []
+    monkeypatch.setattr(
+        "aiohttp.ClientSession",
+        lambda headers=None, connector=None, **kwargs: DummyAiohttpSession(headers, connector),
+    )
+    monkeypatch.setattr("aiohttp.TCPConnector", lambda **kwargs: types.SimpleNamespace(**kwargs))
+    return DummyAiohttpSession
+
+
 @pytest.mark.asyncio
-async def test_async_make_request_handles_missing_errors(monkeypatch):
-    monkeypatch.setattr("aiohttp.ClientSession", lambda headers=None: DummyAiohttpSession(headers))
+async def test_async_make_request_handles_missing_errors(dummy_aiohttp):
     client = AsyncApiClient("https://example.com/api", "TEST_TOKEN")
     res = await client.get_all_business_units()
     assert isinstance(res, dict)
     assert res.get("ok") is True
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_async_session_is_reused_and_closed(dummy_aiohttp):
+    async with AsyncApiClient("https://example.com/api", "TEST_TOKEN", limit_per_host=8) as client:
+        await client.get_all_business_units()
+        await client.get_all_sites("BU1")
+
+    assert len(dummy_aiohttp.instances) == 1
+    session = dummy_aiohttp.instances[0]
+    assert len(session.requests) == 2
+    assert session.headers.get("Authorization") == "Bearer TEST_TOKEN"
+    assert session.connector.limit_per_host == 8
+    assert session.closed is True
+
+
+class SlowCountingSession(DummyAiohttpSession):
+    def request(self, method, url, **kwargs):
+        self.requests.append((method, url))
+        session = self
+
+        class SlowResponse(DummyAiohttpResponse):
+            async def read(self):
+                await asyncio.sleep(0.01)
+                return json.dumps({"Result": [len(session.requests)]}).encode("utf-8")
+
+        return SlowResponse(200)
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_queries_are_coalesced(monkeypatch, dummy_aiohttp):
+    monkeypatch.setattr(
+        "aiohttp.ClientSession",
+        lambda headers=None, connector=None, **kwargs: SlowCountingSession(headers, connector),
+    )
+    async with AsyncApiClient("https://example.com/api", "TEST_TOKEN") as client:
+        results = await asyncio.gather(
+            client.get_all_teams("BU1"),
+            client.get_all_teams("BU1"),
+            client.get_all_teams("BU2"),
+            client.add_team("BU1", "Team", "S1"),
+            client.add_team("BU1", "Team", "S1"),
+        )
+        session = dummy_aiohttp.instances[0]
+
+    assert results[0] == results[1]
+    assert results[0] is not results[1]
+    assert len(session.requests) == 4
+    assert client._inflight == {}
+
+
+def test_session_from_a_previous_event_loop_is_closed(dummy_aiohttp):
+    client = AsyncApiClient("https://example.com/api", "TEST_TOKEN")
+    asyncio.run(client.get_all_business_units())
+    asyncio.run(client.get_all_business_units())
+
+    first, second = dummy_aiohttp.instances
+    assert first.closed is True
+    assert second.closed is False
+    asyncio.run(client.aclose())
+    assert second.closed is True
+
+
+def test_concurrent_first_requests_on_a_new_loop_share_one_session(dummy_aiohttp):
+    client = AsyncApiClient("https://example.com/api", "TEST_TOKEN")
+    asyncio.run(client.get_all_business_units())
 
+    async def first_requests():
+        return await asyncio.gather(client._get_async_session(), client._get_async_session())
 
+    first, second = asyncio.run(first_requests())
+    assert first is second
+    assert len(dummy_aiohttp.instances) == 2
+    asyncio.run(client.aclose())
+    assert all(session.closed for session in dummy_aiohttp.instances)
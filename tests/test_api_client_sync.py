@@ -1,32 +1,35 @@
 import types
 import json
-from calabrio_py.api import ApiClient
+from calabrio_py.api import ApiClient, ExternalMeeting
+from calabrio_py.codec import JsonCodec
 
 
 class DummyResponse:
     def __init__(self, status_code=200, payload=None):
         self.status_code = status_code
+        self.headers = {}
         self._payload = payload or {"Result": [], "Errors": []}
 
     def raise_for_status(self):
         if self.status_code >= 400:
             raise Exception(f"HTTP {self.status_code}")
 
-    def json(self):
-        return self._payload
+    @property
+    def content(self):
+        return json.dumps(self._payload).encode("utf-8")
 
 
 def test_authorization_header_and_url_join(monkeypatch):
     calls = {}
 
-    def fake_request(method, url, **kwargs):
+    def fake_request(session, method, url, **kwargs):
         calls["method"] = method
         calls["url"] = url
         calls["headers"] = kwargs.get("headers", {})
-        calls["json"] = kwargs.get("json")
+        calls["data"] = kwargs.get("data")
         return DummyResponse(200, {"ok": True})
 
-    monkeypatch.setattr("requests.request", fake_request)
+    monkeypatch.setattr("requests.Session.request", fake_request)
 
     client = ApiClient("https://example.com/api", "TEST_TOKEN")
     res = client.get_all_business_units()
@@ -41,11 +44,11 @@ def test_authorization_header_and_url_join(monkeypatch):
 def test_no_double_base_url_when_absolute_passed(monkeypatch):
     calls = {}
 
-    def fake_request(method, url, **kwargs):
+    def fake_request(session, method, url, **kwargs):
         calls["url"] = url
         return DummyResponse(200, {"ok": True})
 
-    monkeypatch.setattr("requests.request", fake_request)
+    monkeypatch.setattr("requests.Session.request", fake_request)
 
     client = ApiClient("https://example.com/api", "TEST_TOKEN")
     # 明示的に絶対URLを渡しても二重結合されないこと
@@ -55,10 +58,10 @@ def test_no_double_base_url_when_absolute_passed(monkeypatch):
 
 
 def test_get_schedules_by_change_date_returns_dict(monkeypatch):
-    def fake_request(method, url, **kwargs):
+    def fake_request(session, method, url, **kwargs):
         return DummyResponse(200, {"ok": True})
 
-    monkeypatch.setattr("requests.request", fake_request)
+    monkeypatch.setattr("requests.Session.request", fake_request)
 
     client = ApiClient("https://example.com/api", "TEST_TOKEN")
     res = client.get_schedules_by_change_date(
@@ -74,15 +77,50 @@ def test_get_schedules_by_change_date_returns_dict(monkeypatch):
 def test_add_person_accepts_dict(monkeypatch):
     captured = {}
 
-    def fake_request(method, url, **kwargs):
-        captured["json"] = kwargs.get("json")
+    def fake_request(session, method, url, **kwargs):
+        captured["data"] = kwargs.get("data")
         return DummyResponse(200, {"ok": True})
 
-    monkeypatch.setattr("requests.request", fake_request)
+    monkeypatch.setattr("requests.Session.request", fake_request)
     client = ApiClient("https://example.com/api", "TEST_TOKEN")
     payload = {"TimeZoneId": "UTC", "BusinessUnitId": "BU1", "FirstName": "A", "LastName": "B"}
     res = client.add_person(payload)
     assert res.get("ok") is True
-    assert captured["json"] == payload
+    assert json.loads(captured["data"]) == payload
 
 
+def test_stdlib_codec_encodes_request_objects(monkeypatch):
+    captured = {}
+
+    def fake_request(session, method, url, **kwargs):
+        captured["data"] = kwargs.get("data")
+        return DummyResponse(200, {"ok": True})
+
+    monkeypatch.setattr("requests.Session.request", fake_request)
+    client = ApiClient("https://example.com/api", "TEST_TOKEN", codec=JsonCodec())
+    meeting = ExternalMeeting("M1", {"StartDate": "2025-01-01"}, ["P1"], Title="Sync")
+    res = client.edit_meetings("UTC", [meeting])
+    assert res.get("ok") is True
+    body = json.loads(captured["data"])
+    assert body["ExternalMeetings"][0]["ExternalMeetingId"] == "M1"
+    assert body["ExternalMeetings"][0]["Title"] == "Sync"
+
+
+def test_session_is_reused_and_closed(monkeypatch):
+    sessions = []
+
+    def fake_request(session, method, url, **kwargs):
+        sessions.append(session)
+        return DummyResponse(200, {"ok": True})
+
+    monkeypatch.setattr("requests.Session.request", fake_request)
+
+    with ApiClient("https://example.com/api", "TEST_TOKEN", pool_maxsize=4) as client:
+        client.get_all_business_units()
+        client.get_person_by_id("P1", "2025-01-01")
+        adapter = client._session.get_adapter("https://example.com/api")
+        assert adapter._pool_maxsize == 4
+
+    assert len(sessions) == 2
+    assert sessions[0] is sessions[1]
+    assert client._session is None
@@ -0,0 +1,92 @@
+import json
+import time
+from calabrio_py.api import ApiClient
+from calabrio_py.cache import DiskResponseCache, ResponseCache
+
+
+class DummyResponse:
+    def __init__(self, payload):
+        self.status_code = 200
+        self.headers = {}
+        self._payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    @property
+    def content(self):
+        return json.dumps(self._payload).encode("utf-8")
+
+
+def test_lru_eviction_ttl_and_stats():
+    cache = ResponseCache(max_entries=2, default_ttl=60, ttls={"/query/Team/AllTeams": 0.01})
+    cache.set("/query/Site/AllSites", "a", {"Result": ["a"]})
+    cache.set("/query/Site/AllSites", "b", {"Result": ["b"]})
+    assert cache.get("/query/Site/AllSites", "a") == {"Result": ["a"]}
+    cache.set("/query/Site/AllSites", "c", {"Result": ["c"]})
+    assert cache.get("/query/Site/AllSites", "b") is None
+
+    cache.set("/query/Team/AllTeams", "t", {"Result": []})
+    time.sleep(0.02)
+    assert cache.get("/query/Team/AllTeams", "t") is None
+
+    cache.set("/query/Person/PersonById", "p", {"Result": []})
+    assert cache.get("/query/Person/PersonById", "p") is None
+
+    assert cache.stats() == {"entries": 1, "hits": 1, "misses": 3, "evictions": 2}
+    cache.invalidate("/query/Site/AllSites")
+    assert cache.stats()["entries"] == 0
+
+
+def test_client_serves_reference_queries_from_cache(monkeypatch):
+    calls = []
+
+    def fake_request(session, method, url, **kwargs):
+        calls.append(url)
+        return DummyResponse({"Result": [{"Id": "S1"}], "Errors": []})
+
+    monkeypatch.setattr("requests.Session.request", fake_request)
+    cache = ResponseCache()
+    client = ApiClient("https://example.com/api", "TEST_TOKEN", cache=cache)
+
+    first = client.get_all_sites("BU1")
+    first["Result"].clear()
+    assert client.get_all_sites("BU1") == {"Result": [{"Id": "S1"}], "Errors": []}
+    client.get_all_sites("BU2")
+    client.get_person_by_id("P1", "2025-01-01")
+    client.get_person_by_id("P1", "2025-01-01")
+
+    assert len(calls) == 4
+    assert cache.stats()["hits"] == 1
+
+    cache.invalidate()
+    client.get_all_sites("BU1")
+    assert len(calls) == 5
+
+
+def test_disk_cache_is_shared_between_instances(tmp_path):
+    writer = DiskResponseCache(str(tmp_path), default_ttl=60)
+    reader = DiskResponseCache(str(tmp_path), default_ttl=60)
+    writer.set("/query/Site/AllSites", ("POST", "u", b"{}", None), {"Result": [{"Id": "S1"}]})
+    assert reader.get("/query/Site/AllSites", ("POST", "u", b"{}", None)) == {"Result": [{"Id": "S1"}]}
+    assert reader.get("/query/Site/AllSites", ("POST", "u", b"{\"x\":1}", None)) is None
+
+    reader.invalidate("/query/Site/AllSites")
+    assert writer.get("/query/Site/AllSites", ("POST", "u", b"{}", None)) is None
+    writer.close()
+    reader.close()
+
+
+def test_disk_cache_expiry_and_size_cap(tmp_path):
+    cache = DiskResponseCache(str(tmp_path), max_bytes=100, ttls={"/query/Team/AllTeams": 0.01})
+    cache.set("/query/Team/AllTeams", "t", {"Result": []})
+    time.sleep(0.02)
+    assert cache.get("/query/Team/AllTeams", "t") is None
+
+    cache.set("/query/Site/AllSites", "a", {"Result": ["a" * 40]})
+    cache.set("/query/Site/AllSites", "b", {"Result": ["b" * 40]})
+    cache.set("/query/Site/AllSites", "c", {"Result": ["c" * 40]})
+    assert cache.get("/query/Site/AllSites", "a") is None
+    assert cache.get("/query/Site/AllSites", "c") == {"Result": ["c" * 40]}
+    assert cache.stats()["bytes"] <= 100
+    cache.close()
@@ -0,0 +1,50 @@
+import pandas as pd
+from calabrio_py.config_index import ConfigIndex
+from calabrio_py.manager import PeopleManager, PersonAccountsManager, ScheduleManager
+
+
+CONFIG = {
+    "bus": [{"Id": "BU1", "Name": "Tokyo"}, {"Id": "BU2", "Name": "Osaka"}],
+    "Tokyo": {
+        "teams": {"Result": [{"Id": "T1", "Name": "Sales", "SiteId": "S1"}]},
+        "absences": {"Result": [{"Id": "A1", "Name": "Holiday"}, {"Id": "A2", "Name": "Sick"}]},
+        "activities": {"Result": [{"Id": "X1", "Name": "Phone"}]},
+    },
+    "Osaka": {
+        "teams": {"Result": [{"Id": "T2", "Name": "Sales", "SiteId": "S2"}]},
+        "absences": {"Result": [{"Id": "A3", "Name": "Holiday"}]},
+        "activities": {"Result": []},
+    },
+}
+
+
+def test_config_index_lookups():
+    index = ConfigIndex(CONFIG)
+
+    assert index.id_for("Osaka", "absences", "Holiday") == "A3"
+    assert index.id_for("Osaka", "absences", "Sick") is None
+    assert index.record_for("teams", "T1")["SiteId"] == "S1"
+    assert index.name_for("absences", "A2") == "Sick"
+    assert index.bu_name_for("teams", "T2") == "Osaka"
+    assert index.bu_names_for("teams", "Sales") == ["Tokyo", "Osaka"]
+    assert index.business_unit_id("Osaka") == "BU2"
+    assert index.records("absences")[-1] == {"Id": "A3", "Name": "Holiday", "BusinessUnitName": "Osaka"}
+
+
+def test_managers_share_the_index():
+    people_mgr = PeopleManager(client=None, config_data=CONFIG)
+    accounts_mgr = PersonAccountsManager(people_mgr)
+    schedule_mgr = ScheduleManager(people_mgr)
+
+    assert accounts_mgr.config_index is people_mgr.config_index
+    assert list(schedule_mgr.absences_df["Id"]) == ["A1", "A2", "A3"]
+    assert schedule_mgr._find_team("Sales") == ("T1", "BU1")
+
+    account = accounts_mgr.add_person_id_and_absence_id(
+        {"BusinessUnitName": "Osaka", "EmploymentNumber": "42", "AbsenceName": "Holiday"},
+        pd.DataFrame([{"BusinessUnitName": "Osaka", "EmploymentNumber": "42", "PersonId": "P42"}]),
+    )
+    assert (account["PersonId"], account["AbsenceId"]) == ("P42", "A3")
+
+    people_mgr.config_data = {"bus": [{"Id": "BU1", "Name": "Tokyo"}], "Tokyo": CONFIG["Tokyo"]}
+    assert people_mgr.config_index.bu_names_for("teams", "Sales") == ["Tokyo"]
@@ -0,0 +1,92 @@
+import pickle
+import pytest
+from calabrio_py.manager import CONFIG_API_METHODS, ConfigManager
+
+
+class FakeAsyncClient:
+    is_async = True
+
+    def __init__(self, probe, delay=0.01):
+        self.probe = probe
+        self.delay = delay
+        self.calls = []
+
+    async def get_all_business_units(self):
+        return {"Result": [{"Id": "BU1", "Name": "Tokyo"}, {"Id": "BU2", "Name": "Osaka"}, {"Id": "BU3", "Name": "Old"}]}
+
+    def __getattr__(self, name):
+        if not name.startswith("get_all_"):
+            raise AttributeError(name)
+
+        async def endpoint(bu_id):
+            self.calls.append((name, bu_id))
+            await self.probe.request(self.delay)
+            return {"Result": [{"Id": f"{name}-{bu_id}", "Name": name}]}
+
+        return endpoint
+
+
+@pytest.mark.asyncio
+async def test_create_config_from_api_fans_out_under_a_bound(probe):
+    client = FakeAsyncClient(probe)
+    manager = ConfigManager(client)
+    config = await manager.create_config_from_api(exclude_bu_names=["Old"], max_concurrent=8)
+
+    assert [bu["Name"] for bu in config["bus"]] == ["Tokyo", "Osaka"]
+    assert len(client.calls) == 2 * len(CONFIG_API_METHODS)
+    assert 1 < probe.peak <= 8
+    assert list(config["Tokyo"].keys()) == [m.split("get_all_")[1] for m in CONFIG_API_METHODS]
+    assert config["Osaka"]["teams"]["Result"][0]["Id"] == "get_all_teams-BU2"
+
+
+@pytest.mark.asyncio
+async def test_refresh_config_refetches_only_stale_entries(tmp_path, probe):
+    client = FakeAsyncClient(probe, delay=0)
+    config_path = str(tmp_path / "config.json")
+    manager = ConfigManager(client, config_path=config_path)
+    await manager.create_config_from_api(exclude_bu_names=["Old"])
+
+    reloaded = ConfigManager(client, config_path=config_path)
+    reloaded.load_config()
+    assert "_meta" not in reloaded.config_data
+    assert reloaded.config_meta["Tokyo"]["teams"]["hash"] == manager.config_meta["Tokyo"]["teams"]["hash"]
+
+    client.calls.clear()
+    assert await reloaded.refresh_config(max_age=3600, exclude_bu_names=["Old"]) == {}
+    assert client.calls == []
+
+    reloaded.config_meta["Tokyo"]["teams"]["fetched_at"] = 0
+    reloaded.config_meta["Osaka"]["sites"]["fetched_at"] = 0
+    reloaded.config_meta["Osaka"]["sites"]["hash"] = "outdated"
+    changes = await reloaded.refresh_config(max_age=3600, exclude_bu_names=["Old"])
+    assert sorted(client.calls) == [("get_all_sites", "BU2"), ("get_all_teams", "BU1")]
+    assert changes == {"Osaka": ["sites"]}
+
+    changes = await reloaded.refresh_config(max_age=3600)
+    assert changes == {"Old": [m.split("get_all_")[1] for m in CONFIG_API_METHODS]}
+
+
+@pytest.mark.asyncio
+async def test_binary_snapshot_round_trip_is_lazy(tmp_path, probe):
+    pytest.importorskip("msgpack")
+
+    client = FakeAsyncClient(probe, delay=0)
+    config_path = str(tmp_path / "config.msgpack")
+    manager = ConfigManager(client, config_path=config_path)
+    config = await manager.create_config_from_api(exclude_bu_names=["Old"])
+
+    reloaded = ConfigManager(client, config_path=config_path)
+    snapshot = reloaded.load_config()
+    assert snapshot["bus"] == config["bus"]
+    assert reloaded.config_meta == manager.config_meta
+    assert list(snapshot["Tokyo"].keys()) == list(config["Tokyo"].keys())
+    assert all(type(v).__name__ == "_Pending" for v in snapshot["Osaka"]._items.values())
+    assert snapshot["Osaka"]["teams"] == config["Osaka"]["teams"]
+    assert type(snapshot["Osaka"]._items["sites"]).__name__ == "_Pending"
+
+    remapped = pickle.loads(pickle.dumps(snapshot))
+    assert remapped["Tokyo"]["roles"] == config["Tokyo"]["roles"]
+
+    reloaded.config_path = str(tmp_path / "config.json")
+    reloaded.save_config()
+    assert ConfigManager(client, config_path=reloaded.config_path).load_config() == config
@@ -0,0 +1,470 @@
+import pandas as pd
+import pytest
+from calabrio_py.manager import CONFIG_FRAMES, PeopleManager, lookup_join
+
+
+class FakePeopleClient:
+    def __init__(self, probe, teams_per_bu=10, failing_teams=(), delay=0.005):
+        self.probe = probe
+        self.teams_per_bu = teams_per_bu
+        self.failing_teams = set(failing_teams)
+        self.delay = delay
+        self.roster_calls = []
+
+    async def get_all_business_units(self):
+        return {"Result": [{"Id": "BU1", "Name": "Tokyo"}, {"Id": "BU2", "Name": "Osaka"}]}
+
+    async def get_all_teams(self, bu_id):
+        return {
+            "Result": [
+                {"Id": f"{bu_id}-T{i}", "Name": f"Team {i}"} for i in range(self.teams_per_bu)
+            ]
+        }
+
+    async def get_people_by_team_id(self, team_id, date):
+        self.roster_calls.append((team_id, date))
+        await self.probe.request(self.delay)
+        if team_id in self.failing_teams:
+            raise RuntimeError("boom")
+        bu_id = team_id.split("-")[0]
+        return {
+            "Result": [
+                {"Id": f"{team_id}-P{i}", "BusinessUnitId": bu_id, "EmploymentNumber": f"{team_id}-{i}"}
+                for i in range(2)
+            ]
+        }
+
+
+@pytest.mark.asyncio
+async def test_team_fan_out_is_bounded_and_tolerates_failures(probe):
+    client = FakePeopleClient(probe, failing_teams={"BU2-T3"})
+    manager = PeopleManager(client)
+
+    people = await manager.fetch_teams_and_people_as_of_date("2025-01-01", max_concurrent=4)
+
+    assert len(client.roster_calls) == 20
+    assert 1 < probe.peak <= 4
+    assert len(people) == 19 * 2
+    assert [(f["BusinessUnitName"], f["TeamId"]) for f in manager.failed_teams] == [("Osaka", "BU2-T3")]
+
+
+@pytest.mark.asyncio
+async def test_team_fan_out_skips_excluded_business_units(probe):
+    client = FakePeopleClient(probe, teams_per_bu=3)
+    manager = PeopleManager(client)
+
+    people = await manager.fetch_teams_and_people_as_of_date("2025-01-01", exclude_bu_names=["Osaka"])
+
+    assert {call[0].split("-")[0] for call in client.roster_calls} == {"BU1"}
+    assert len(people) == 6
+    assert manager.failed_teams == []
+
+
+def make_config(bu_names=("Tokyo", "Osaka")):
+    config = {"bus": [{"Id": f"BU{i + 1}", "Name": name} for i, name in enumerate(bu_names)]}
+    for i, name in enumerate(bu_names):
+        bu_id = f"BU{i + 1}"
+        config[name] = {
+            key: {"Result": [{"Id": f"{bu_id}-{key}", "Name": f"{name} {key}"}]}
+            for key in CONFIG_FRAMES
+        }
+        config[name]["sites"]["Result"] = [{"Id": f"{bu_id}-S", "Name": f"{name} site"}]
+        config[name]["teams"]["Result"] = [
+            {"Id": f"{bu_id}-T{t}", "Name": f"Team {t}", "SiteId": f"{bu_id}-S", "SiteName": f"{name} site"}
+            for t in range(10)
+        ]
+    return config
+
+
+class FakeRosterClient(FakePeopleClient):
+    """Rosters whose members differ by date: P0 leaves before year end, P2 joins."""
+
+    async def get_people_by_team_id(self, team_id, date):
+        self.roster_calls.append((team_id, date))
+        bu_id = team_id.split("-")[0]
+        members = [0, 1] if date != "2099-12-31" else [1, 2]
+        return {
+            "Result": [
+                {
+                    "Id": f"{team_id}-P{i}",
+                    "BusinessUnitId": bu_id,
+                    "EmploymentNumber": f"{team_id}-{i}",
+                    "SiteId": f"{bu_id}-S",
+                    "TeamId": team_id,
+                    "ContractId": f"{bu_id}-contracts",
+                    "Roles": [{"RoleId": f"{bu_id}-roles"}],
+                    "Date": date,
+                }
+                for i in members
+            ]
+        }
+
+
+@pytest.mark.asyncio
+async def test_fetch_all_people_with_eoy_fetches_teams_once(monkeypatch, probe):
+    client = FakeRosterClient(probe, teams_per_bu=10)
+    teams_calls = []
+    original = client.get_all_teams
+
+    async def get_all_teams(bu_id):
+        teams_calls.append(bu_id)
+        return await original(bu_id)
+
+    client.get_all_teams = get_all_teams
+    real_to_datetime = pd.to_datetime
+
+    def to_datetime(value, *args, **kwargs):
+        return real_to_datetime("2099-06-01" if value == "today" else value, *args, **kwargs)
+
+    monkeypatch.setattr(pd, "to_datetime", to_datetime)
+    manager = PeopleManager(client, config_data=make_config())
+
+    people_df = await manager.fetch_all_people(date="2099-06-01", include_eoy=True)
+
+    assert sorted(teams_calls) == ["BU1", "BU2"]
+    assert len(client.roster_calls) == 40
+    assert len(people_df) == 20 * 3
+    assert not people_df.duplicated(subset=["BusinessUnitId", "EmploymentNumber"]).any()
+    # people present on both dates keep their as-of-date record
+    assert set(people_df[people_df["EmploymentNumber"].str.endswith("-1")]["Date"]) == {"2099-06-01"}
+    assert people_df["ContractName"].notna().all()
+
+
+class MutableRosterClient(FakePeopleClient):
+    def __init__(self, probe):
+        super().__init__(probe, teams_per_bu=2, delay=0)
+        self.rosters = {
+            f"{bu_id}-T{t}": [self.person(bu_id, f"{bu_id}-T{t}", i) for i in range(3)]
+            for bu_id in ("BU1", "BU2")
+            for t in range(2)
+        }
+
+    @staticmethod
+    def person(bu_id, team_id, i, **changes):
+        return {
+            "Id": f"{team_id}-P{i}",
+            "BusinessUnitId": bu_id,
+            "EmploymentNumber": f"{team_id}-{i}",
+            "SiteId": f"{bu_id}-S",
+            "TeamId": team_id,
+            "ContractId": f"{bu_id}-contracts",
+            "Roles": [{"RoleId": f"{bu_id}-roles"}],
+            **changes,
+        }
+
+    async def get_people_by_team_id(self, team_id, date):
+        self.roster_calls.append((team_id, date))
+        if team_id in self.failing_teams:
+            raise RuntimeError("boom")
+        return {"Result": [dict(person) for person in self.rosters[team_id]]}
+
+
+@pytest.mark.asyncio
+async def test_sync_people_applies_only_changes(probe):
+    client = MutableRosterClient(probe)
+    manager = PeopleManager(client, config_data=make_config())
+    await manager.fetch_all_people(date="2025-01-01")
+    assert len(manager.people_df) == 12
+
+    roster = client.rosters["BU1-T0"]
+    roster[1] = client.person("BU1", "BU1-T0", 1, Email="new@example.com")
+    del roster[2]
+    roster.append(client.person("BU1", "BU1-T0", 9))
+    client.failing_teams = {"BU2-T1"}
+    client.rosters["BU2-T1"] = []
+
+    changes = await manager.sync_people(date="2025-01-01")
+
+    assert list(changes["inserted"]["PersonId"]) == ["BU1-T0-P9"]
+    assert list(changes["updated"]["PersonId"]) == ["BU1-T0-P1"]
+    assert list(changes["removed"]["PersonId"]) == ["BU1-T0-P2"]
+    assert len(manager.people_df) == 12
+    assert manager.people_df["PersonId"].is_unique
+    updated = manager.people_df[manager.people_df["PersonId"] == "BU1-T0-P1"].iloc[0]
+    assert updated["Email"] == "new@example.com"
+    assert updated["ContractName"] == "Tokyo contracts"
+
+    client.failing_teams = set()
+    changes = await manager.sync_people(date="2025-01-01")
+    assert changes["inserted"].empty and changes["updated"].empty
+    assert sorted(changes["removed"]["PersonId"]) == [f"BU2-T1-P{i}" for i in range(3)]
+
+
+def test_lookup_join_matches_left_merge():
+    left = pd.DataFrame(
+        {
+            "SiteId": ["S1", "S2", "S9", "S1", None],
+            "BusinessUnitName": ["Tokyo", "Tokyo", "Tokyo", "Osaka", "Tokyo"],
+            "Note": ["a", "b", "c", "d", "e"],
+        }
+    )
+    right = pd.DataFrame(
+        {
+            "SiteId": ["S1", "S2", "S1"],
+            "BusinessUnitName": ["Tokyo", "Tokyo", "Osaka"],
+            "SiteName": ["Shinjuku", "Shibuya", "Umeda"],
+            "Note": ["x", "y", "z"],
+            "Seats": [10, 20, 30],
+        }
+    )
+    on = ["SiteId", "BusinessUnitName"]
+
+    joined = lookup_join(left, right, on)
+    expected = left.merge(right, on=on, how="left")
+
+    pd.testing.assert_frame_equal(joined, expected, check_dtype=False)
+
+
+def test_merge_and_filter_config_data_extracts_first_role():
+    manager = PeopleManager(client=None, config_data=make_config(("Tokyo",)))
+    manager.fetch_config_data_for_business_unit("Tokyo")
+    manager.fetch_config_data_as_df()
+    people_df = pd.DataFrame(
+        [
+            {"BusinessUnitName": "Tokyo", "SiteId": "BU1-S", "TeamId": "BU1-T0", "ContractId": "BU1-contracts",
+             "Roles": [{"RoleId": "BU1-roles"}, {"RoleId": "other"}]},
+            {"BusinessUnitName": "Tokyo", "SiteId": "BU1-S", "TeamId": "BU1-T1", "ContractId": "missing",
+             "Roles": []},
+        ]
+    )
+
+    merged = manager.merge_and_filter_config_data(people_df)
+
+    assert list(merged["RoleName"].fillna("-")) == ["Tokyo roles", "-"]
+    assert list(merged["SiteTeamName"]) == ["Team 0", "Team 1"]
+    assert merged["ContractName"].isna().tolist() == [False, True]
+
+    # A sync batch of new hires may have no roles at all
+    no_roles = manager.merge_and_filter_config_data(people_df.assign(Roles=[[], []]))
+    assert no_roles["RoleId"].isna().all() and no_roles["RoleName"].isna().all()
+
+
+@pytest.mark.asyncio
+async def test_low_memory_people_df_uses_shared_categoricals(probe):
+    client = MutableRosterClient(probe)
+    manager = PeopleManager(client, config_data=make_config(), low_memory=True)
+    people_df = await manager.fetch_all_people(date="2025-01-01")
+
+    for column in ("BusinessUnitName", "SiteName", "SiteTeamName", "ContractName", "RoleName"):
+        assert isinstance(people_df[column].dtype, pd.CategoricalDtype), column
+    assert people_df["BusinessUnitName"].dtype is manager.config_index.category_dtype("bus")
+    assert set(people_df["ContractName"]) == {"Tokyo contracts", "Osaka contracts"}
+
+    client.rosters["BU1-T0"].append(client.person("BU1", "BU1-T0", 9))
+    await manager.sync_people(date="2025-01-01")
+    assert isinstance(manager.people_df["SiteTeamName"].dtype, pd.CategoricalDtype)
+
+    report = manager.memory_usage_report()
+    people_row = report[report["Name"] == "people_df"].iloc[0]
+    assert people_row["Rows"] == 13
+    assert people_row["CategoricalColumns"] >= 5
+    assert people_row["MemoryMB"] > 0
+
+
+def test_category_dtype_appends_unknown_names():
+    manager = PeopleManager(client=None, config_data=make_config(("Tokyo",)))
+    index = manager.config_index
+    dtype = index.category_dtype("teams")
+    assert list(dtype.categories) == [f"Team {t}" for t in range(10)]
+
+    extended = index.category_dtype("teams", ["Team 1", "Ad hoc", None])
+    assert list(extended.categories) == list(dtype.categories) + ["Ad hoc"]
+    assert index.category_dtype("teams") is extended
+
+
+class FakeOnboardingClient:
+    def __init__(self, probe, delay=0.005):
+        self.probe = probe
+        self.delay = delay
+        self.requests = []
+
+    async def add_person(self, request):
+        await self.probe.request(self.delay)
+        self.requests.append(request)
+        if request["EmploymentNumber"] == "reject":
+            return {"Result": None, "Errors": ["Duplicate"]}
+        return {"Result": {"Id": f"P-{request['EmploymentNumber']}"}, "Errors": []}
+
+
+def onboarding_row(employment_number, **changes):
+    return {
+        "BusinessUnitName": "Tokyo",
+        "TeamName": "Team 1",
+        "ContractName": "Tokyo contracts",
+        "RoleName": "Tokyo roles",
+        "ContractScheduleName": "Tokyo contract_schedules",
+        "PartTimePercentageName": "Tokyo part_time_percentages",
+        "TimeZoneId": "Tokyo Standard Time",
+        "FirstName": "Ada",
+        "LastName": "Lovelace",
+        "StartDate": "2025-04-01",
+        "EmploymentNumber": employment_number,
+        **changes,
+    }
+
+
+@pytest.mark.asyncio
+async def test_add_people_by_df_resolves_validates_and_submits_concurrently(probe):
+    client = FakeOnboardingClient(probe)
+    manager = PeopleManager(client, config_data=make_config())
+    people_df = pd.DataFrame(
+        [onboarding_row(str(i)) for i in range(8)]
+        + [
+            onboarding_row("bad-team", TeamName="Nope"),
+            onboarding_row("reject"),
+            onboarding_row(
+                "osaka",
+                BusinessUnitName="Osaka",
+                ContractName="Osaka contracts",
+                RoleName="Osaka roles",
+                ContractScheduleName="Osaka contract_schedules",
+                PartTimePercentageName="Osaka part_time_percentages",
+            ),
+        ]
+    )
+
+    log = await manager.add_people_by_df(people_df, max_concurrent=3)
+
+    assert 1 < probe.peak <= 3
+    assert len(log) == 10
+    assert [entry[1] for entry in log][-2:] == ["reject", "osaka"]
+    osaka = client.requests[[r["EmploymentNumber"] for r in client.requests].index("osaka")]
+    assert (osaka["BusinessUnitId"], osaka["TeamId"], osaka["RoleIds"]) == ("BU2", "BU2-T1", ["BU2-roles"])
+    assert osaka["WorkflowControlSetId"] == "" and osaka["FirstDayOfWeek"] == 1
+
+    report = manager.add_people_report
+    assert list(report["EmploymentNumber"].unique()) == ["bad-team"]
+    assert "TeamName" in set(report["Column"])
+
+    results = manager.add_people_results
+    assert results.set_index("EmploymentNumber")["Status"].to_dict() == {
+        **{str(i): "added" for i in range(8)},
+        "bad-team": "invalid",
+        "reject": "failed",
+        "osaka": "added",
+    }
+
+
+class FakeAccessibilityClient:
+    def __init__(self, probe, known, rejected=(), unanswered=(), delay=0.005):
+        self.probe = probe
+        self.known = known
+        self.rejected = set(rejected)
+        self.unanswered = set(unanswered)
+        self.delay = delay
+        self.lookups = []
+        self.updates = []
+
+    async def get_people_by_employment_numbers(self, employment_numbers, date):
+        self.lookups.append(list(employment_numbers))
+        if "lost" in employment_numbers:
+            return None
+        return {
+            "Result": [
+                {
+                    "Id": f"P{number}",
+                    "BusinessUnitId": "BU1",
+                    "EmploymentNumber": number,
+                    "Email": f"{number}@example.com",
+                    "Identity": f"id{number}",
+                    "FirstName": "Ada",
+                    "LastName": "Lovelace",
+                    "WorkflowControlSetId": "W1",
+                    "Note": "",
+                    "TerminationDate": "2025-01-31" if number != "3" else None,
+                }
+                for number in employment_numbers
+                if number in self.known
+            ]
+        }
+
+    async def set_details_for_person(self, **kwargs):
+        await self.probe.request(self.delay)
+        self.updates.append(kwargs)
+        if kwargs["person_id"] in self.rejected:
+            return {"Result": None, "Errors": [{"Message": "Email already in use"}]}
+        if kwargs["person_id"] in self.unanswered:
+            return None
+        return {"Result": None, "Errors": []}
+
+
+@pytest.mark.asyncio
+async def test_remove_people_runs_bulk_switches_with_a_bound(probe):
+    client = FakeAccessibilityClient(probe, known={str(i) for i in range(12)})
+    manager = PeopleManager(client)
+    numbers = [str(i) for i in range(12)] + ["missing"]
+
+    results = await manager.switch_people_accessibility(
+        numbers, max_concurrent=4, chunk_size=5, as_df=True, remove=True
+    )
+
+    assert [len(chunk) for chunk in client.lookups] == [5, 5, 3]
+    assert 1 < probe.peak <= 4
+    assert len(client.updates) == 11
+    update = next(u for u in client.updates if u["person_id"] == "P0")
+    assert update["employment_number"] == "D0"
+    assert update["email"] == "xxx0@example.com"
+    assert (update["first_name"], update["workflow_control_set_id"]) == ("Ada", "W1")
+
+    by_number = results.set_index("EmploymentNumber")
+    assert len(results) == 13
+    assert not by_number.loc["3", "Success"] and "not terminated" in by_number.loc["3", "Result"]
+    assert by_number.loc["missing", "Result"] == "Employment number not found"
+    assert by_number["Success"].sum() == 11
+
+    log = await manager.recover_people_by_employment_numbers(["1"])
+    assert log[0][1] == "1" and log[0][4][5] is True
+    assert client.updates[-1]["employment_number"] == "1"
+
+
+def test_people_index_lookups_follow_people_df():
+    manager = PeopleManager(client=None)
+    manager.people_df = pd.DataFrame(
+        {
+            "PersonId": ["P1", "P2", "P3"],
+            "EmploymentNumber": ["1", "N2", "3"],
+            "Email": ["a@x", "b@x", "c@x"],
+            "BusinessUnitName": ["Tokyo", "Tokyo", "Osaka"],
+            "SiteTeamName": ["Sales", "Sales", "Sales"],
+            "EmploymentStartDate": ["2025-01-01", "2025-03-01", "2025-03-01"],
+        }
+    )
+    index = manager.people_index
+
+    assert index.by_employment_number("3")["PersonId"] == "P3"
+    assert index.by_person_id("P2")["Email"] == "b@x"
+    assert index.by_email("missing") is None
+    assert list(index.by_team("Tokyo", "Sales")["PersonId"]) == ["P1", "P2"]
+    assert list(index.rows("EmploymentNumber", ["3", "1", "9"])["PersonId"]) == ["P3", "P1"]
+    assert list(index.rows("EmploymentNumber", ["1", "3", "1"])["PersonId"]) == ["P1", "P3"]
+    assert manager.get_one_day_before_start_date("N2") == "2025-02-28"
+
+    manager.people_df.loc[3] = ["P4", "4", "d@x", "Osaka", "Sales", "2025-04-01"]
+    assert index.by_employment_number("4")["PersonId"] == "P4"
+
+    manager.people_df = manager.people_df.iloc[:2]
+    assert manager.people_index is not index
+    assert manager.people_index.by_employment_number("3") is None
+
+
+@pytest.mark.asyncio
+async def test_switch_records_rejected_updates_and_failed_lookups(probe):
+    client = FakeAccessibilityClient(
+        probe, known={"4", "5", "6", "7"}, rejected={"P5"}, unanswered={"P6"}
+    )
+    manager = PeopleManager(client)
+    numbers = ["4", "5", "6", "8", "lost", "7"]
+
+    results = await manager.switch_people_accessibility(
+        numbers, chunk_size=2, as_df=True, remove=True
+    )
+
+    success = results.set_index("EmploymentNumber")["Success"].to_dict()
+    assert success == {"4": True, "5": False, "6": False, "8": False, "lost": False, "7": False}
+    by_number = results.set_index("EmploymentNumber")["Result"]
+    assert by_number["8"] == "Employment number not found"
+    assert by_number["lost"].startswith("Lookup failed") and by_number["7"].startswith("Lookup failed")
+    assert [u["person_id"] for u in client.updates] == ["P4", "P5", "P6"]
+
+    log = await manager.remove_people_by_employment_numbers(["5", "lost"])
+    assert [(entry[1], entry[5]) for entry in log] == [("5", False), ("lost", False)]
@@ -0,0 +1,96 @@
+import os
+import json
+import time
+import pandas as pd
+import pytest
+from calabrio_py.manager import PeopleManager
+from calabrio_py.people_snapshot import read_snapshot_meta, snapshot_dates, write_people_snapshot
+
+pytest.importorskip("pyarrow")
+
+
+def people_frame():
+    return pd.DataFrame(
+        {
+            "PersonId": ["P1", "P2", "P3"],
+            "EmploymentNumber": ["1", "2", "3"],
+            "BusinessUnitName": ["Tokyo", "Osaka", "Tokyo / East"],
+            "Roles": [[{"RoleId": "R1"}], [], None],
+            "ContractName": ["Full", None, "Part"],
+        }
+    )
+
+
+def test_snapshot_round_trip_with_projection_and_bu_filter(tmp_path):
+    root = str(tmp_path / "people")
+    manager = PeopleManager(client=None)
+    manager.people_df = people_frame()
+    manager.save_people_snapshot(root, date="2025-01-01")
+    manager.people_df = people_frame().iloc[:1]
+    manager.save_people_snapshot(root, date="2025-01-02")
+
+    assert snapshot_dates(root) == ["2025-01-01", "2025-01-02"]
+    assert read_snapshot_meta(root)["rows"] == 1
+    assert os.path.isdir(os.path.join(root, "2025-01-01"))
+
+    loaded = manager.load_people_snapshot(root, date="2025-01-01")
+    assert list(loaded.columns) == list(people_frame().columns)
+    roles = loaded.set_index("PersonId")["Roles"]
+    assert (roles["P1"], roles["P2"]) == ([{"RoleId": "R1"}], [])
+    assert pd.isna(roles["P3"])
+    assert manager.people_index.by_person_id("P3")["BusinessUnitName"] == "Tokyo / East"
+
+    subset = manager.load_people_snapshot(
+        root,
+        date="2025-01-01",
+        columns=["EmploymentNumber", "Missing"],
+        bu_names=["Tokyo / East", "Osaka"],
+    )
+    assert list(subset.columns) == ["EmploymentNumber"]
+    assert sorted(subset["EmploymentNumber"]) == ["2", "3"]
+    assert manager.people_df.shape == people_frame().shape
+
+
+@pytest.mark.asyncio
+async def test_load_or_fetch_people_respects_freshness(tmp_path, monkeypatch):
+    root = str(tmp_path / "people")
+    manager = PeopleManager(client=None)
+    fetches = []
+
+    async def fetch_all_people(date=None, **kwargs):
+        fetches.append(date)
+        manager.people_df = people_frame()
+        return manager.people_df
+
+    monkeypatch.setattr(manager, "fetch_all_people", fetch_all_people)
+
+    first = await manager.load_or_fetch_people(root, date="2025-01-01", bu_names=["Tokyo"])
+    assert list(first["PersonId"]) == ["P1"]
+    second = await manager.load_or_fetch_people(root, date="2025-01-01", max_age=60)
+    assert len(second) == 3 and fetches == ["2025-01-01"]
+
+    real_time = time.time
+    monkeypatch.setattr(time, "time", lambda: real_time() + 120)
+    await manager.load_or_fetch_people(root, date="2025-01-01", max_age=60)
+    assert fetches == ["2025-01-01", "2025-01-01"]
+
+
+def test_unfinished_snapshot_writes_are_not_listed(tmp_path, monkeypatch):
+    root = str(tmp_path / "people")
+    write_people_snapshot(root, people_frame(), "2025-01-01")
+    os.makedirs(os.path.join(root, ".2025-01-02.tmp123", "BusinessUnitName=Tokyo"))
+    assert snapshot_dates(root) == ["2025-01-01"]
+
+    def crash(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(json, "dump", crash)
+    with pytest.raises(OSError):
+        write_people_snapshot(root, people_frame(), "2025-01-02")
+    assert snapshot_dates(root) == ["2025-01-01"]
+
+    monkeypatch.undo()
+    write_people_snapshot(root, people_frame().iloc[:1], "2025-01-01")
+    assert snapshot_dates(root) == ["2025-01-01"]
+    assert read_snapshot_meta(root)["rows"] == 1
+    assert sorted(os.listdir(root)) == [".2025-01-02.tmp123", "2025-01-01", "2025-01-02"]
@@ -0,0 +1,213 @@
+import asyncio
+import pandas as pd
+import pytest
+from calabrio_py.manager import PeopleManager, PersonAccountsManager
+
+
+CONFIG = {
+    "bus": [{"Id": "BU1", "Name": "Tokyo"}],
+    "Tokyo": {"absences": {"Result": [{"Id": "A1", "Name": "Holiday"}]}},
+}
+
+
+class FakeAccountsClient:
+    def __init__(self, probe, slow=(), failing=(), delay=0.01, slow_delay=0.2):
+        self.probe = probe
+        self.slow = set(slow)
+        self.failing = set(failing)
+        self.delay = delay
+        self.slow_delay = slow_delay
+        self.events = []
+
+    async def get_person_accounts_by_person_id(self, business_unit_id, person_id, date):
+        self.events.append(("start", person_id))
+        try:
+            await self.probe.request(self.slow_delay if person_id in self.slow else self.delay)
+        finally:
+            self.events.append(("end", person_id))
+        if person_id in self.failing:
+            return None
+        return {
+            "Result": [
+                {
+                    "AbsenceId": "A1",
+                    "Period": {"StartDate": "2025-01-01", "EndDate": "2025-12-31"},
+                    "BalanceIn": 0,
+                    "Remaining": 10,
+                }
+            ]
+        }
+
+
+def make_people(n):
+    return pd.DataFrame(
+        {
+            "BusinessUnitId": ["BU1"] * n,
+            "BusinessUnitName": ["Tokyo"] * n,
+            "PersonId": [f"P{i}" for i in range(n)],
+            "Email": [f"{i}@example.com" for i in range(n)],
+            "EmploymentNumber": [str(i) for i in range(n)],
+            "ContractName": ["Full"] * n,
+        }
+    )
+
+
+def make_manager(client, n):
+    people_mgr = PeopleManager(client, config_data=CONFIG)
+    people_mgr.people_df = make_people(n)
+    return PersonAccountsManager(people_mgr)
+
+
+@pytest.mark.asyncio
+async def test_person_account_pool_caps_concurrency_without_chunk_barriers(probe):
+    client = FakeAccountsClient(probe, slow={"P0"}, failing={"P7"}, delay=0.001, slow_delay=0.2)
+    manager = make_manager(client, 400)
+    await manager.fetch_config_data_as_df()
+
+    accounts_df = await manager.fetch_person_accounts(
+        date="2025-01-01", with_id=True, details=True, max_concurrent=20
+    )
+
+    assert probe.peak == 20
+    # The straggler holds one worker only: everyone else is fetched before it ends
+    assert client.events[-1] == ("end", "P0")
+    assert manager.failed_person_ids == ["P7"]
+    assert len(accounts_df) == 399
+    assert set(accounts_df["AbsenceName"]) == {"Holiday"}
+
+
+@pytest.mark.asyncio
+async def test_stream_person_accounts_yields_in_completion_order(probe):
+    client = FakeAccountsClient(probe, slow={"P0"}, delay=0.001, slow_delay=0.05)
+    manager = make_manager(client, 5)
+
+    order = [
+        person_id
+        async for person_id, _ in manager.stream_person_accounts(
+            manager.people_df, "2025-01-01", max_concurrent=2
+        )
+    ]
+
+    assert sorted(order) == ["P0", "P1", "P2", "P3", "P4"]
+    assert order[-1] == "P0"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("filename", ["accounts.csv", "accounts.jsonl", "accounts.parquet"])
+async def test_fetch_person_accounts_streams_batches_to_file_sinks(tmp_path, filename, probe):
+    if filename.endswith(".parquet"):
+        pytest.importorskip("pyarrow")
+    client = FakeAccountsClient(probe, delay=0)
+    manager = make_manager(client, 25)
+    path = str(tmp_path / filename)
+
+    sink = await manager.fetch_person_accounts(
+        date="2025-01-01",
+        with_id=True,
+        details=True,
+        max_concurrent=5,
+        sink=path,
+        batch_size=10,
+    )
+
+    assert (sink.rows, sink.batches) == (25, 3)
+    if filename.endswith(".csv"):
+        written = pd.read_csv(path)
+    elif filename.endswith(".jsonl"):
+        written = pd.read_json(path, lines=True)
+    else:
+        written = pd.read_parquet(path)
+    assert len(written) == 25
+    assert set(written["AbsenceName"]) == {"Holiday"}
+    assert sorted(written["PersonId"]) == sorted(f"P{i}" for i in range(25))
+
+
+@pytest.mark.asyncio
+async def test_fetch_person_accounts_passes_batches_to_a_callback(probe):
+    client = FakeAccountsClient(probe, delay=0)
+    manager = make_manager(client, 7)
+    batches = []
+
+    sink = await manager.fetch_person_accounts(
+        date="2025-01-01", details=True, sink=batches.append, batch_size=3
+    )
+
+    assert [len(batch) for batch in batches] == [3, 3, 1]
+    assert sink.rows == 7
+    assert "PersonId" not in batches[0].columns
+    assert batches[0]["StartDate"].iloc[0] == pd.Timestamp("2025-01-01")
+
+
+@pytest.mark.asyncio
+async def test_unknown_absence_name_raises_before_calling_the_api(probe):
+    manager = make_manager(FakeAccountsClient(probe), 1)
+
+    with pytest.raises(ValueError, match="Sick"):
+        await manager.adhoc_update_person_account_by_employment_number(
+            "0", "Sick", "2025-01-01", 0, 0, 0
+        )
+    account = {"BusinessUnitName": "Tokyo", "EmploymentNumber": "0", "AbsenceName": "Holiday"}
+    assert manager.add_person_id_and_absence_id(account, manager.people_df)["AbsenceId"] == "A1"
+
+
+@pytest.mark.asyncio
+async def test_stream_resets_failures_and_reraises_worker_errors(monkeypatch, probe):
+    client = FakeAccountsClient(probe, failing={"P1"}, delay=0)
+    manager = make_manager(client, 4)
+
+    for _ in range(2):
+        async for _ in manager.stream_person_accounts(manager.people_df, "2025-01-01"):
+            pass
+    assert manager.failed_person_ids == ["P1"]
+
+    async def broken(client, business_unit_id, person_id, date):
+        raise RuntimeError(f"worker died on {person_id}")
+
+    monkeypatch.setattr(manager, "_fetch_single_person_account", broken)
+
+    async def consume():
+        return [item async for item in manager.stream_person_accounts(manager.people_df, "2025-01-01")]
+
+    with pytest.raises(RuntimeError, match="worker died"):
+        await asyncio.wait_for(consume(), timeout=5)
+
+
+def test_parquet_sink_ignores_interrupted_part_files(tmp_path):
+    pytest.importorskip("pyarrow")
+    from calabrio_py.sinks import ParquetSink
+
+    path = str(tmp_path / "accounts.parquet")
+    sink = ParquetSink(path)
+    sink.write(pd.DataFrame({"PersonId": ["P1", "P2"]}))
+    with open(tmp_path / "accounts.parquet" / ".part-00001.parquet.tmp", "wb") as file:
+        file.write(b"PAR1 truncated")
+
+    assert list(pd.read_parquet(path)["PersonId"]) == ["P1", "P2"]
+
+
+def test_parquet_sink_keeps_one_schema_and_clears_old_parts(tmp_path):
+    pytest.importorskip("pyarrow")
+    from calabrio_py.sinks import ParquetSink
+
+    path = str(tmp_path / "accounts.parquet")
+    stale = ParquetSink(path)
+    stale.write(pd.DataFrame({"PersonId": ["OLD"], "TrackedBy": ["Days"]}))
+
+    sink = ParquetSink(path)
+    sink.write(pd.DataFrame({"PersonId": ["P1", "P2"], "TrackedBy": [None, None]}))
+    sink.write(pd.DataFrame({"PersonId": ["P3"], "TrackedBy": ["Days"]}))
+
+    written = pd.read_parquet(path)
+    assert list(written["PersonId"]) == ["P1", "P2", "P3"]
+    assert written["TrackedBy"].isna().tolist() == [True, True, False]
+
+
+@pytest.mark.asyncio
+async def test_max_retry_warns_that_it_is_ignored(probe):
+    manager = make_manager(FakeAccountsClient(probe, delay=0), 2)
+
+    with pytest.warns(DeprecationWarning, match="retry_policy"):
+        accounts_df = await manager.fetch_person_accounts(
+            date="2025-01-01", details=True, max_retry=5
+        )
+    assert len(accounts_df) == 2
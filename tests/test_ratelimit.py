@@ -0,0 +1,47 @@
+import asyncio
+import time
+import pytest
+from calabrio_py.ratelimit import AdaptiveRateLimiter, parse_retry_after
+
+
+def test_parse_retry_after_seconds_and_invalid():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("not a date") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+def test_aimd_window_grows_on_success_and_shrinks_on_throttle():
+    limiter = AdaptiveRateLimiter(initial_concurrency=10, max_concurrency=20, cooldown=0)
+    limiter._in_flight = 1
+    limiter.release(200)
+    assert limiter._limit > 10
+
+    limiter._in_flight = 1
+    limiter.release(429, "0")
+    assert limiter.concurrency == 5
+    assert limiter.throttled_count == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_shared_and_retry_after_pauses_callers():
+    limiter = AdaptiveRateLimiter(initial_concurrency=2, max_concurrency=2)
+    peak = 0
+
+    async def worker(status):
+        nonlocal peak
+        await limiter.acquire()
+        peak = max(peak, limiter.in_flight)
+        await asyncio.sleep(0.01)
+        limiter.release(status)
+
+    await asyncio.gather(*[worker(200) for _ in range(6)])
+    assert peak == 2
+    assert limiter.in_flight == 0
+
+    await limiter.acquire()
+    limiter.release(503, "0.1")
+    started = time.monotonic()
+    await limiter.acquire()
+    assert time.monotonic() - started >= 0.09
+    limiter.release(200)
@@ -0,0 +1,82 @@
+import json
+import time
+import pytest
+from calabrio_py.api import ApiClient
+from calabrio_py.retry import RetryPolicy
+
+
+class DummyResponse:
+    def __init__(self, status_code=200, payload=None, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self._payload = payload or {"Result": [], "Errors": []}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            import requests
+            raise requests.exceptions.HTTPError(f"HTTP {self.status_code}")
+
+    @property
+    def content(self):
+        return json.dumps(self._payload).encode("utf-8")
+
+
+def fake_responses(monkeypatch, responses):
+    calls = []
+
+    def fake_request(session, method, url, **kwargs):
+        calls.append(url)
+        return responses.pop(0)
+
+    monkeypatch.setattr("requests.Session.request", fake_request)
+    return calls
+
+
+def test_full_jitter_delay_is_bounded():
+    policy = RetryPolicy(base_delay=1.0, max_delay=4.0)
+    for attempt in range(6):
+        assert 0 <= policy.backoff(attempt) <= min(4.0, 2 ** attempt)
+
+
+def test_commands_are_only_retried_when_rejected():
+    policy = RetryPolicy()
+    started = time.monotonic()
+    command = "https://example.com/api/command/AddPerson"
+    query = "https://example.com/api/query/Person/PersonById"
+    assert policy.next_delay(0, "POST", command, started, status=500) is None
+    assert policy.next_delay(0, "POST", command, started, status=429) is not None
+    assert policy.next_delay(0, "POST", query, started, status=500) is not None
+    assert policy.next_delay(0, "POST", query, started, status=400) is None
+
+
+def test_retry_after_and_total_budget():
+    policy = RetryPolicy(total_timeout=5)
+    started = time.monotonic()
+    url = "https://example.com/api/query/Site/AllSites"
+    assert policy.next_delay(0, "POST", url, started, status=429, retry_after="2") >= 2
+    assert policy.next_delay(0, "POST", url, started, status=429, retry_after="60") is None
+
+
+def test_sync_client_retries_transient_query_errors(monkeypatch):
+    calls = fake_responses(
+        monkeypatch,
+        [DummyResponse(503, headers={"Retry-After": "0"}), DummyResponse(200, {"ok": True})],
+    )
+    client = ApiClient("https://example.com/api", "TEST_TOKEN", retry_policy=RetryPolicy(base_delay=0))
+    res = client.get_all_sites("BU1")
+    assert res.get("ok") is True
+    assert len(calls) == 2
+
+
+def test_sync_client_does_not_retry_failed_command(monkeypatch):
+    calls = fake_responses(monkeypatch, [DummyResponse(500), DummyResponse(200, {"ok": True})])
+    client = ApiClient("https://example.com/api", "TEST_TOKEN", retry_policy=RetryPolicy(base_delay=0))
+    assert client.add_team("BU1", "Team", "S1") is None
+    assert len(calls) == 1
+
+
+def test_manager_retry_decorator_is_deprecated():
+    from calabrio_py.manager import retry
+
+    with pytest.warns(DeprecationWarning):
+        retry(lambda: None)
@@ -0,0 +1,48 @@
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+import pytest
+from calabrio_py.manager import PeopleManager
+
+pytest.importorskip("pyarrow")
+
+
+def count_roles(handle):
+    people_mgr = handle.attach_manager()
+    people_df = people_mgr.people_df
+    role_counts = dict(zip(people_df["PersonId"], people_df["Roles"].map(len)))
+    return role_counts, list(people_mgr.teams_df["SiteTeamName"])
+
+
+def make_manager():
+    manager = PeopleManager(client=None)
+    manager.people_df = pd.DataFrame(
+        {
+            "PersonId": ["P1", "P2"],
+            "BusinessUnitName": pd.Categorical(["Tokyo", "Osaka"]),
+            "Roles": [[{"RoleId": "R1"}, {"RoleId": "R2"}], []],
+            "Seats": [1, 2],
+        }
+    )
+    manager.teams_df = pd.DataFrame({"TeamId": ["T1"], "SiteTeamName": ["Sales"]})
+    return manager
+
+
+def test_shared_export_round_trip_in_process():
+    with make_manager().export_shared() as state:
+        handle = pickle.loads(pickle.dumps(state.handle()))
+        assert len(pickle.dumps(state.handle())) < 1000
+        people_df = handle.people_df
+        assert list(people_df["Roles"]) == [[{"RoleId": "R1"}, {"RoleId": "R2"}], []]
+        assert isinstance(people_df["BusinessUnitName"].dtype, pd.CategoricalDtype)
+        assert handle.tables["people_df"].table().num_rows == 2
+        assert list(handle.frame("people_df", columns=["Seats"]).columns) == ["Seats"]
+        assert state.nbytes > 0
+        handle.close()
+
+
+def test_shared_export_is_readable_from_worker_processes():
+    with make_manager().export_shared() as state:
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            results = list(pool.map(count_roles, [state.handle()] * 2))
+    assert results == [({"P1": 2, "P2": 0}, ["Sales"])] * 2
@@ -0,0 +1,93 @@
+import json
+import types
+import pytest
+from calabrio_py.api import ApiClient, AsyncApiClient
+from calabrio_py.codec import JsonCodec
+from calabrio_py.streaming import ResultStreamParser
+
+DOC = {
+    "Errors": [{"Message": "quoted \"]\" text"}],
+    "Result": [
+        {"PersonId": "a\\\"],", "Result": [1, 2], "Shift": None},
+        123,
+        "s,t]",
+        [1, [2]],
+        True,
+    ],
+    "Tail": {"Result": [9]},
+}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 5, 4096])
+def test_parser_yields_result_items_across_chunk_boundaries(chunk_size):
+    raw = json.dumps(DOC, indent=1).encode("utf-8")
+    parser = ResultStreamParser(JsonCodec())
+    items = []
+    for i in range(0, len(raw), chunk_size):
+        items.extend(parser.feed(raw[i:i + chunk_size]))
+    envelope = parser.close()
+    assert items == DOC["Result"]
+    assert envelope == {**DOC, "Result": []}
+
+
+def test_parser_rejects_truncated_document():
+    parser = ResultStreamParser(JsonCodec())
+    assert parser.feed(b'{"Result": [{"Id": 1}, {"Id"') == [{"Id": 1}]
+    with pytest.raises(ValueError):
+        parser.close()
+
+
+def test_sync_stream_yields_items(monkeypatch):
+    raw = json.dumps({"Result": [{"Id": 1}, {"Id": 2}], "Errors": []}).encode("utf-8")
+
+    class StreamingResponse:
+        status_code = 200
+        headers = {}
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def iter_content(self, chunk_size):
+            for i in range(0, len(raw), 3):
+                yield raw[i:i + 3]
+
+    monkeypatch.setattr("requests.Session.request", lambda session, method, url, **kwargs: StreamingResponse())
+    client = ApiClient("https://example.com/api", "TEST_TOKEN")
+    items = list(client.get_people_by_team_id("T1", "2025-01-01", stream=True))
+    assert items == [{"Id": 1}, {"Id": 2}]
+
+
+@pytest.mark.asyncio
+async def test_async_stream_yields_items(monkeypatch):
+    raw = json.dumps({"Result": [{"PersonId": "P1"}, {"PersonId": "P2"}]}).encode("utf-8")
+
+    class StreamingContent:
+        async def iter_chunked(self, size):
+            for i in range(0, len(raw), 4):
+                yield raw[i:i + 4]
+
+    class StreamingResponse:
+        status = 200
+        headers = {}
+        content = StreamingContent()
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+    class Session:
+        closed = False
+
+        def request(self, method, url, **kwargs):
+            return StreamingResponse()
+
+    monkeypatch.setattr("aiohttp.ClientSession", lambda **kwargs: Session())
+    monkeypatch.setattr("aiohttp.TCPConnector", lambda **kwargs: types.SimpleNamespace(**kwargs))
+    client = AsyncApiClient("https://example.com/api", "TEST_TOKEN")
+    items = [item async for item in client.get_schedule_by_person_ids(["P1", "P2"], "2025-01-01", "2025-01-31", stream=True)]
+    assert [item["PersonId"] for item in items] == ["P1", "P2"]